@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP fast path against Selenium on the local fixture store
+Reports pages/sec for each mode and checks both extract the same records
+"""
+
+import sys
+import time
+from config import CRAWLER_CONFIG
+from fixture_server import start_fixture_server, DEFAULT_FIXTURE_REGIONS
+from page_parser import GAMES_PER_PAGE
+
+def fixture_pages():
+    """Every (region, page) pair served by the fixture store"""
+    pages = []
+    for region, (total_games, _) in DEFAULT_FIXTURE_REGIONS.items():
+        total_pages = max(1, -(-total_games // GAMES_PER_PAGE))
+        pages.extend((region, page_num) for page_num in range(1, total_pages + 1))
+    return pages
+
+def run_http_mode(pages):
+    """Fetch every fixture page over plain HTTP"""
+    from http_fetcher import HttpPageFetcher
+
+    fetcher = HttpPageFetcher()
+    results = {}
+    start = time.perf_counter()
+    for region, page_num in pages:
+        page = fetcher.fetch_page(region, page_num)
+        results[(region, page_num)] = page
+    elapsed = time.perf_counter() - start
+    fetcher.close()
+    return results, elapsed
+
+def run_selenium_mode(pages):
+    """Load every fixture page in headless Chrome"""
+    from main_crawler import PlayStationCrawler
+
+    crawler = PlayStationCrawler()
+    results = {}
+    try:
+        start = time.perf_counter()
+        for region, page_num in pages:
+            results[(region, page_num)] = crawler.load_page(region, page_num)
+        elapsed = time.perf_counter() - start
+    finally:
+        crawler.close()
+    return results, elapsed
+
+def summarize(name, results, elapsed):
+    """Print throughput and tile coverage for one mode"""
+    found = sum(1 for page in results.values() if page and page['tile_count'])
+    print(f"{name:>10}: {len(results)} pages in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} pages/sec), tiles found on {found}/{len(results)} pages")
+
+def main():
+    """Run both fetch modes against the fixture store"""
+    print("=== Fetch Mode Benchmark (offline fixture store) ===\n")
+
+    server, base_url = start_fixture_server()
+    CRAWLER_CONFIG['store_base_url'] = base_url
+    # No politeness limit against the local fixture store
+    CRAWLER_CONFIG['requests_per_second'] = 1000
+    CRAWLER_CONFIG['rate_limit_burst'] = 1000
+    CRAWLER_CONFIG['timeout'] = 5
+    pages = fixture_pages()
+    print(f"🧪 Fixture store at {base_url} ({len(pages)} pages)\n")
+
+    try:
+        http_results, http_elapsed = run_http_mode(pages)
+        summarize('http', http_results, http_elapsed)
+
+        try:
+            selenium_results, selenium_elapsed = run_selenium_mode(pages)
+        except Exception as e:
+            print(f"  selenium: skipped ({e})")
+            return 0
+        summarize('selenium', selenium_results, selenium_elapsed)
+
+        # Records must match wherever both modes found tiles
+        mismatches = []
+        for key, http_page in http_results.items():
+            selenium_page = selenium_results.get(key)
+            if http_page and http_page['tile_count'] and selenium_page:
+                http_records = [(g['game_name'], g['display_rank']) for g in http_page['games']]
+                selenium_records = [(g['game_name'], g['display_rank']) for g in selenium_page['games']]
+                if http_records != selenium_records:
+                    mismatches.append(key)
+
+        print(f"\n⚡ Speedup: {selenium_elapsed / http_elapsed:.1f}x")
+        if mismatches:
+            print(f"❌ Records differ between modes on: {mismatches}")
+            return 1
+        print("✅ Both modes extracted identical records")
+        return 0
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    sys.exit(main())
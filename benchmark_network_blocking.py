@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Measure the effect of CDP resource blocking on category page weight
+Loads the same pages with blocking off and on and reports bytes and load time per page
+
+Usage: python benchmark_network_blocking.py [region ...]
+"""
+
+import sys
+import time
+from config import NETWORK_BLOCKING_CONFIG
+from region_crawler import RegionCrawler
+from network_blocking import measure_page_weight
+
+DEFAULT_REGIONS = ['en-us', 'en-gb', 'ja-jp']
+
+def load_pages(regions, blocking):
+    """Load page 1 of every region in a fresh browser and return {region: measurement}"""
+    NETWORK_BLOCKING_CONFIG['enabled'] = blocking
+    crawler = RegionCrawler()
+    results = {}
+    try:
+        for region in regions:
+            start = time.perf_counter()
+            page = crawler.load_page(region, 1)
+            elapsed = time.perf_counter() - start
+            weight = measure_page_weight(crawler.driver) or {}
+            results[region] = {
+                'tiles_rendered': page is not None,
+                'bytes': weight.get('bytes'),
+                'requests': weight.get('requests'),
+                'load_ms': weight.get('load_ms'),
+                'ready_s': elapsed
+            }
+    finally:
+        crawler.close()
+    return results
+
+def format_bytes(value):
+    if value is None:
+        return 'n/a'
+    return f"{value / 1024:.0f} KB"
+
+def main():
+    """Compare page weight with and without resource blocking"""
+    regions = sys.argv[1:] or DEFAULT_REGIONS
+    print("=== Network Blocking Benchmark ===\n")
+
+    enabled = NETWORK_BLOCKING_CONFIG['enabled']
+    record = NETWORK_BLOCKING_CONFIG['record_page_weight']
+    NETWORK_BLOCKING_CONFIG['record_page_weight'] = False
+    try:
+        before = load_pages(regions, blocking=False)
+        after = load_pages(regions, blocking=True)
+    finally:
+        NETWORK_BLOCKING_CONFIG['enabled'] = enabled
+        NETWORK_BLOCKING_CONFIG['record_page_weight'] = record
+
+    print(f"{'region':<12}{'bytes before':>14}{'bytes after':>14}{'ready before':>14}{'ready after':>14}  tiles")
+    total_before = total_after = 0
+    for region in regions:
+        b, a = before[region], after[region]
+        total_before += b['bytes'] or 0
+        total_after += a['bytes'] or 0
+        tiles = '✅' if a['tiles_rendered'] else '❌'
+        print(f"{region:<12}{format_bytes(b['bytes']):>14}{format_bytes(a['bytes']):>14}"
+              f"{b['ready_s']:>13.2f}s{a['ready_s']:>13.2f}s  {tiles}")
+
+    if total_before:
+        saved = 100 * (1 - total_after / total_before)
+        print(f"\n📉 Total transfer: {format_bytes(total_before)} -> {format_bytes(total_after)} ({saved:.0f}% less)")
+
+    if not all(after[region]['tiles_rendered'] for region in regions):
+        print("❌ Tiles did not render on every page with blocking enabled")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on saved category pages
+Reports ms/page and peak memory for each backend and checks they extract the same records
+
+Usage: python benchmark_parsers.py [saved_pages_dir]
+
+Saved pages are *.html files named <region>_<page>.html (e.g. en-us_1.html), such as
+page_source dumps from a real crawl. Without a directory the fixture store pages are used,
+padded with header/footer markup so they weigh roughly what a live category page does.
+"""
+
+import sys
+import time
+import tracemalloc
+import multiprocessing
+from parser_backends import PARSER_BACKENDS, available_backends, parse_tiles
+from fixture_server import DEFAULT_FIXTURE_REGIONS, load_recorded_pages, record_fixture_pages
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROUNDS = 5
+
+def load_saved_pages(directory):
+    """[(region, page_num, html)] from a directory of saved pages"""
+    return [(region, page_num, html) for (region, page_num), html in load_recorded_pages(directory).items()]
+
+def fixture_pages():
+    """[(region, page_num, html)] for every server-rendered fixture page, padded to live page weight"""
+    regions = {region: spec for region, spec in DEFAULT_FIXTURE_REGIONS.items() if spec[1] == 'ssr' and spec[0]}
+    return [(region, page_num, html) for (region, page_num), html in record_fixture_pages(regions).items()]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_backend(backend, pages, queue):
+    """Parse every page ROUNDS times with one backend (runs in its own process for clean memory numbers)"""
+    records = {}
+    for region, page_num, html in pages:
+        page = parse_tiles(html, region, page_num, 'benchmark', backend)
+        records[(region, page_num)] = ([(g['game_name'], g['display_rank']) for g in page['games']], page['max_page'])
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for region, page_num, html in pages:
+            parse_tiles(html, region, page_num, 'benchmark', backend)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for region, page_num, html in pages:
+        parse_tiles(html, region, page_num, 'benchmark', backend)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queue.put({
+        'ms_per_page': 1000 * elapsed / (ROUNDS * len(pages)),
+        'traced_peak_mb': traced_peak / (1024 * 1024),
+        'peak_rss_mb': peak_rss_mb(),
+        'records': records
+    })
+
+def main():
+    """Time every installed parser backend on the same pages"""
+    print("=== Parser Backend Benchmark ===\n")
+    if len(sys.argv) > 1:
+        pages = load_saved_pages(sys.argv[1])
+        print(f"📂 {len(pages)} saved pages from {sys.argv[1]}")
+    else:
+        pages = fixture_pages()
+        print(f"🧪 {len(pages)} fixture pages (no saved page directory given)")
+    if not pages:
+        print("❌ No pages to parse")
+        return 1
+    average_kb = sum(len(html) for _, _, html in pages) / len(pages) / 1024
+    print(f"   average page size {average_kb:.0f} KB, {ROUNDS} rounds\n")
+
+    context = multiprocessing.get_context('spawn')
+    installed = available_backends()
+    results = {}
+    print(f"{'backend':<14}{'ms/page':>10}{'traced peak':>14}{'peak RSS':>12}  records")
+    for backend in PARSER_BACKENDS:
+        if backend not in installed:
+            print(f"{backend:<14}{'not installed':>36}")
+            continue
+        queue = context.Queue()
+        process = context.Process(target=run_backend, args=(backend, pages, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        results[backend] = result
+
+        matches = result['records'] == results['bs4']['records']
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"{backend:<14}{result['ms_per_page']:>10.2f}{result['traced_peak_mb']:>11.1f} MB{rss:>12}  "
+              f"{'✅' if matches else '❌'}")
+
+    baseline = results['bs4']['ms_per_page']
+    fastest = min(results, key=lambda name: results[name]['ms_per_page'])
+    print(f"\n⚡ Fastest: {fastest} ({baseline / results[fastest]['ms_per_page']:.1f}x faster than full bs4)")
+
+    if any(result['records'] != results['bs4']['records'] for result in results.values()):
+        print("❌ Backends extracted different records")
+        return 1
+    print("✅ Every backend extracted identical records")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Offline replay benchmark - runs the PlayStationCrawler extraction path against recorded
+category pages served by the local fixture store, with a SQLite stand-in for MySQL.
+Reports pages/sec, p50/p95 page latency and peak RSS, and saves the results as JSON
+so runs can be compared.
+
+Usage: python benchmark_replay.py [--pages-dir DIR] [--latency SECONDS] [--jitter SECONDS]
+                                  [--workers N] [--fetch-mode auto|selenium] [--compare RESULTS.json]
+
+Recorded pages are *.html files named <region>_<page>.html (see benchmark_parsers.py).
+Without a directory, fixture pages for several regions and page counts are used, padded
+to live page weight.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import multiprocessing
+from datetime import date, datetime
+from fixture_server import start_fixture_server, load_recorded_pages, record_fixture_pages
+from benchmark_parsers import peak_rss_mb
+from database_utils import game_info_json
+
+# region -> (total pre-order games, render style), from a large storefront down to an empty one
+REPLAY_REGIONS = {
+    'en-us': (300, 'ssr'),
+    'en-gb': (204, 'ssr'),
+    'de-de': (120, 'ssr'),
+    'ja-jp': (96, 'state'),
+    'fr-fr': (48, 'ssr'),
+    'en-au': (20, 'ssr'),
+    'en-is': (0, 'ssr')
+}
+
+RESULTS_DIR = 'benchmark_results'
+
+class SqliteGameStore:
+    """
+    Stand-in for DatabaseManager that stores the same preorder_games rows in SQLite,
+    so the insert path is exercised without a MySQL server
+    """
+
+    def __init__(self, database=':memory:'):
+        self.database = database
+        self.connection = None
+
+    def connect(self):
+        self.connection = sqlite3.connect(self.database, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS preorder_games ("
+            "crawl_date TEXT NOT NULL, region TEXT NOT NULL, game_info TEXT NOT NULL, "
+            "PRIMARY KEY (crawl_date, region))")
+        return True
+
+    def test_connection(self):
+        return True
+
+    def disconnect(self):
+        if self.connection:
+            self.connection.close()
+
+    def insert_games_for_region(self, region, games_data):
+        """Same JSON shape as DatabaseManager.insert_games_for_region"""
+        return self.insert_snapshots([(region, games_data)])
+
+    def insert_snapshots(self, snapshots):
+        """Same rows as DatabaseManager.insert_snapshots, one executemany and commit per batch"""
+        today = date.today().isoformat()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO preorder_games (crawl_date, region, game_info) VALUES (?, ?, ?)",
+            [(today, region, game_info_json(games_data)) for region, games_data in snapshots])
+        self.connection.commit()
+        return True
+
+    def stored_games(self):
+        """{region: number of games stored}"""
+        rows = self.connection.execute("SELECT region, game_info FROM preorder_games").fetchall()
+        return {region: len(json.loads(game_info)) for region, game_info in rows}
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(p * (len(samples) - 1))))]
+
+def run_replay(base_url, regions, settings, queue):
+    """Crawl every region against the replay server (runs in its own process for clean memory numbers)"""
+    from config import CRAWLER_CONFIG
+    CRAWLER_CONFIG['store_base_url'] = base_url
+    CRAWLER_CONFIG['fetch_mode'] = settings['fetch_mode']
+    # No politeness limit against the local store - the benchmark measures the crawler itself
+    CRAWLER_CONFIG['requests_per_second'] = 1000
+    CRAWLER_CONFIG['rate_limit_burst'] = 1000
+    CRAWLER_CONFIG['rate_limit_max'] = 1000
+    CRAWLER_CONFIG['timeout'] = 10
+    CRAWLER_CONFIG['retry_backoff_base'] = 0.1
+
+    from main_crawler import PlayStationCrawler
+    from region_crawler import RegionCrawler
+    from browser_pool import BrowserWorkerPool
+    from write_behind import WriteBehindBuffer
+
+    page_latencies = []
+
+    class ReplayCrawler(PlayStationCrawler):
+        """PlayStationCrawler with the SQLite stand-in and per-page timing; no log file, no email"""
+
+        def __init__(self, db_manager):
+            self.db_manager = db_manager
+            RegionCrawler.__init__(self)
+            if self.http_fetcher:
+                fetch_http_page = self.http_fetcher.fetch_page
+                self.http_fetcher.fetch_page = lambda region, page_num: self.timed(fetch_http_page, region, page_num)
+
+        def timed(self, fetch, region, page_num):
+            start = time.perf_counter()
+            try:
+                return fetch(region, page_num)
+            finally:
+                page_latencies.append(time.perf_counter() - start)
+
+        def load_page(self, region, page_num):
+            return self.timed(super().load_page, region, page_num)
+
+    store = SqliteGameStore(settings['database'])
+    store.connect()
+    crawler = ReplayCrawler(store)
+    pool = BrowserWorkerPool(num_workers=settings['workers'], primary=crawler,
+                             crawler_factory=lambda: ReplayCrawler(store))
+    write_buffer = WriteBehindBuffer(store).start()
+    errors = {}
+    start = time.perf_counter()
+    try:
+        for region, games, error in pool.crawl(list(regions)):
+            if error:
+                errors[region] = error
+            elif games:
+                write_buffer.add(region, games)
+        write_buffer.close()
+        elapsed = time.perf_counter() - start
+        stored = store.stored_games()
+    finally:
+        crawler.close()
+        store.disconnect()
+
+    queue.put({
+        'elapsed': elapsed,
+        'page_latencies': page_latencies,
+        'stored': stored,
+        'errors': errors,
+        'peak_rss_mb': peak_rss_mb()
+    })
+
+def compare(results, previous_file):
+    """Print the change of each headline number against an earlier results file"""
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\n📊 Compared with {previous_file} ({previous['timestamp']}):")
+    for key, label, higher_is_better in (('pages_per_sec', 'pages/sec', True),
+                                         ('p50_page_ms', 'p50 page latency (ms)', False),
+                                         ('p95_page_ms', 'p95 page latency (ms)', False),
+                                         ('peak_rss_mb', 'peak RSS (MB)', False)):
+        old, new = previous.get(key), results.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        better = change > 0 if higher_is_better else change < 0
+        print(f"   {label:<24}{old:>10.1f} -> {new:<10.1f}{change:+.1f}% {'✅' if better or abs(change) < 2 else '⚠️'}")
+
+def main():
+    """Replay recorded pages through the crawler and save the results"""
+    parser = argparse.ArgumentParser(description="Offline replay benchmark")
+    parser.add_argument('--pages-dir', help="directory of recorded <region>_<page>.html pages")
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.1, help="extra random delay of up to this many seconds")
+    parser.add_argument('--workers', type=int, default=1, help="crawler workers (BrowserWorkerPool)")
+    parser.add_argument('--fetch-mode', choices=['auto', 'selenium'], default='auto')
+    parser.add_argument('--database', default=':memory:', help="SQLite file standing in for MySQL")
+    parser.add_argument('--output', help=f"results file (default {RESULTS_DIR}/replay_<timestamp>.json)")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    print("=== Offline Replay Benchmark ===\n")
+    if args.pages_dir:
+        pages = load_recorded_pages(args.pages_dir)
+        expected = None
+        source = args.pages_dir
+    else:
+        pages = record_fixture_pages(REPLAY_REGIONS)
+        expected = {region: total_games for region, (total_games, _) in REPLAY_REGIONS.items() if total_games}
+        source = 'fixture'
+    if not pages:
+        print("❌ No recorded pages to replay")
+        return 1
+    regions = sorted({region for region, _ in pages})
+
+    server, base_url = start_fixture_server(recorded_pages=pages, latency=args.latency, jitter=args.jitter)
+    print(f"🧪 Replaying {len(pages)} pages of {len(regions)} regions ({source}) at {base_url}")
+    print(f"   latency {args.latency:.2f}s + up to {args.jitter:.2f}s jitter, {args.workers} worker(s), "
+          f"fetch mode {args.fetch_mode}\n")
+
+    settings = {
+        'pages_dir': args.pages_dir,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'workers': args.workers,
+        'fetch_mode': args.fetch_mode,
+        'database': args.database
+    }
+    try:
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=run_replay, args=(base_url, regions, settings, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+    finally:
+        server.shutdown()
+
+    latencies = result['page_latencies']
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'settings': settings,
+        'regions': len(regions),
+        'pages': len(latencies),
+        'requests': len(server.request_times),
+        'games_stored': sum(result['stored'].values()),
+        'elapsed_sec': round(result['elapsed'], 3),
+        'pages_per_sec': round(len(latencies) / result['elapsed'], 2) if result['elapsed'] else None,
+        'p50_page_ms': round(1000 * percentile(latencies, 0.50), 1) if latencies else None,
+        'p95_page_ms': round(1000 * percentile(latencies, 0.95), 1) if latencies else None,
+        'peak_rss_mb': round(result['peak_rss_mb'], 1) if result['peak_rss_mb'] is not None else None,
+        'errors': result['errors']
+    }
+
+    print(f"⏱️  {results['pages']} pages in {results['elapsed_sec']:.2f}s ({results['pages_per_sec']} pages/sec)")
+    print(f"   page latency p50 {results['p50_page_ms']} ms, p95 {results['p95_page_ms']} ms")
+    print(f"   peak RSS {results['peak_rss_mb']} MB, {results['games_stored']} games stored")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"replay_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if result['errors']:
+        print(f"\n❌ Regions failed: {result['errors']}")
+        return 1
+    if expected is not None and result['stored'] != expected:
+        print(f"\n❌ Stored games differ from the replayed pages: {result['stored']} != {expected}")
+        return 1
+    print("\n✅ Every replayed region was stored completely")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
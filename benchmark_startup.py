@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - verifies that importing main_crawler has no network side effects,
+measures how long the import and the region list load take, and measures the
+time-to-first-region-request of a fresh crawler process against a target
+
+Usage: python benchmark_startup.py [--target SECONDS] [--skip-selenium]
+"""
+
+import sys
+import time
+import socket
+import argparse
+import subprocess
+
+DEFAULT_TARGET_SECONDS = 3.0
+CHILD_TIMEOUT_SECONDS = 120
+
+# Every outbound connection attempt during import is recorded here
+network_calls = []
+_socket_originals = {}
+
+def _block_network():
+    """Replace socket entry points so any network access is recorded and refused"""
+    def blocked(name):
+        def _blocked(*args, **kwargs):
+            network_calls.append((name, args[:2]))
+            raise OSError(f"Network access blocked during startup benchmark ({name})")
+        return _blocked
+
+    _socket_originals.update({
+        'connect': socket.socket.connect,
+        'connect_ex': socket.socket.connect_ex,
+        'create_connection': socket.create_connection,
+        'getaddrinfo': socket.getaddrinfo
+    })
+    socket.socket.connect = blocked('socket.connect')
+    socket.socket.connect_ex = blocked('socket.connect_ex')
+    socket.create_connection = blocked('socket.create_connection')
+    socket.getaddrinfo = blocked('socket.getaddrinfo')
+
+def _unblock_network():
+    """Restore the socket entry points replaced by _block_network"""
+    if _socket_originals:
+        socket.socket.connect = _socket_originals['connect']
+        socket.socket.connect_ex = _socket_originals['connect_ex']
+        socket.create_connection = _socket_originals['create_connection']
+        socket.getaddrinfo = _socket_originals['getaddrinfo']
+
+def benchmark_import():
+    """Time a cold import of main_crawler with the network blocked"""
+    _block_network()
+    try:
+        start = time.perf_counter()
+        import main_crawler  # noqa: F401
+        import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from remove_duplicate_country_codes import get_unique_codes
+        codes = get_unique_codes(revalidate=False)
+        load_time = time.perf_counter() - start
+    finally:
+        _unblock_network()
+
+    return import_time, load_time, codes
+
+def first_request_child(base_url, fetch_mode):
+    """
+    Runs in a fresh process: start a crawler the way run_crawler does (minus the
+    database check) and request page 1 of the first region from the fixture store
+    """
+    from config import CRAWLER_CONFIG
+    CRAWLER_CONFIG['store_base_url'] = base_url
+    CRAWLER_CONFIG['fetch_mode'] = fetch_mode
+    from main_crawler import RegionCrawler
+    from remove_duplicate_country_codes import get_unique_codes
+
+    crawler = RegionCrawler()
+    try:
+        crawler.fetch_page(get_unique_codes(revalidate=False)[0], 1)
+    finally:
+        crawler.close()
+    return 0
+
+def time_to_first_request(region, fetch_mode):
+    """
+    Seconds from launching a crawler process until its first category page request
+    reaches the local fixture store, or (None, reason) if no request arrived
+    """
+    from fixture_server import start_fixture_server
+    from page_parser import GAMES_PER_PAGE
+
+    server, base_url = start_fixture_server({region: (GAMES_PER_PAGE, 'ssr')})
+    try:
+        start = time.time()
+        try:
+            result = subprocess.run([sys.executable, __file__, '--first-request-child', base_url, fetch_mode],
+                                    capture_output=True, text=True, timeout=CHILD_TIMEOUT_SECONDS)
+            failure = result.stderr.strip().splitlines()[-1:] if result.returncode else None
+        except subprocess.TimeoutExpired:
+            failure = [f"no request within {CHILD_TIMEOUT_SECONDS}s"]
+        if not server.request_times:
+            return None, failure[0] if failure else "no request was sent"
+        return server.request_times[0] - start, None
+    finally:
+        server.shutdown()
+
+def main():
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Crawler startup benchmark")
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET_SECONDS,
+                        help="time-to-first-region-request budget in seconds")
+    parser.add_argument('--skip-selenium', action='store_true', help="only measure the HTTP fast path")
+    parser.add_argument('--first-request-child', nargs=2, metavar=('BASE_URL', 'FETCH_MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.first_request_child:
+        return first_request_child(*args.first_request_child)
+
+    print("=== PlayStation Store Crawler Startup Benchmark ===\n")
+
+    import_time, load_time, codes = benchmark_import()
+
+    print(f"⏱️  import main_crawler: {import_time * 1000:.1f} ms")
+    print(f"⏱️  region list load:    {load_time * 1000:.1f} ms ({len(codes)} regions)")
+
+    if network_calls:
+        print(f"\n❌ {len(network_calls)} network call(s) attempted during import:")
+        for name, call_args in network_calls[:10]:
+            print(f"   {name}{call_args}")
+        return 1
+
+    print("\n✅ No network access during import")
+
+    print(f"\n⏱️  Time to first region request (target {args.target:.1f}s):")
+    modes = ['auto'] if args.skip_selenium else ['auto', 'selenium']
+    over_budget = []
+    for fetch_mode in modes:
+        elapsed, failure = time_to_first_request(codes[0], fetch_mode)
+        if elapsed is None:
+            print(f"   {fetch_mode:<9} skipped ({failure})")
+            continue
+        within = elapsed <= args.target
+        if not within:
+            over_budget.append(fetch_mode)
+        print(f"   {fetch_mode:<9} {elapsed:.2f}s {'✅' if within else '❌'}")
+
+    if over_budget:
+        print(f"\n❌ Over the startup budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Browser worker pool - crawls regions in parallel, one Chrome WebDriver per worker
+"""
+
+import queue
+import logging
+import threading
+from config import CRAWLER_CONFIG
+from region_crawler import RegionCrawler, DriverStartupError
+
+class BrowserWorkerPool:
+    def __init__(self, num_workers=None, primary=None, crawler_factory=RegionCrawler):
+        """
+        num_workers: number of parallel browsers (defaults to CRAWLER_CONFIG['browser_workers'])
+        primary: an already-running RegionCrawler to use as the first worker instead of launching a new browser
+        crawler_factory: callable creating a new RegionCrawler for every other worker
+
+        Finished regions wait in a queue of CRAWLER_CONFIG['pipeline_queue_size'] entries;
+        when the caller falls behind, workers block instead of buffering more regions.
+        """
+        self.num_workers = max(1, num_workers or CRAWLER_CONFIG['browser_workers'])
+        self.primary = primary
+        self.crawler_factory = crawler_factory
+        self.stop_event = threading.Event()
+
+    def _put(self, results, item):
+        """Hand a result to the caller, waiting while the queue is full unless the pool is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                results.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _worker(self, worker_id, work_queue, results):
+        """Worker loop - owns its own driver and keeps crawling until the queue is empty"""
+        crawler = None
+        owns_crawler = False
+        try:
+            if worker_id == 0 and self.primary is not None:
+                crawler = self.primary
+            else:
+                crawler = self.crawler_factory()
+                owns_crawler = True
+        except Exception as e:
+            # A crawler that fails to start only takes this worker out; the others drain the queue
+            logging.error(f"Worker {worker_id} failed to start: {e}")
+            self._put(results, ('worker_done', worker_id, None, None))
+            return
+
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    region = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                logging.info(f"Worker {worker_id} starting crawl for region: {region}")
+                try:
+                    games = crawler.crawl_region_with_retries(region)
+                    self._put(results, ('result', worker_id, region, games))
+                except DriverStartupError as e:
+                    # Chrome is launched lazily, so a browser that cannot start shows up here;
+                    # hand the region back to the other workers and retire this one
+                    logging.error(f"Worker {worker_id} could not start its WebDriver: {e}")
+                    work_queue.put(region)
+                    break
+                except Exception as e:
+                    logging.error(f"Worker {worker_id} failed on {region}: {e}")
+                    self._put(results, ('error', worker_id, region, str(e)))
+        finally:
+            if owns_crawler:
+                crawler.close()
+            self._put(results, ('worker_done', worker_id, None, None))
+
+    def crawl(self, regions):
+        """
+        Crawl the regions across the worker pool.
+        Yields (region, games, error) in completion order so the caller can keep doing
+        the database writes on its own thread. Regions left over when every worker has
+        died are yielded with an error.
+        """
+        self.stop_event.clear()
+        work_queue = queue.Queue()
+        for region in regions:
+            work_queue.put(region)
+
+        results = queue.Queue(maxsize=CRAWLER_CONFIG['pipeline_queue_size'] + self.num_workers)
+        num_workers = min(self.num_workers, max(1, len(regions)))
+        threads = []
+        for worker_id in range(num_workers):
+            thread = threading.Thread(target=self._worker, args=(worker_id, work_queue, results),
+                                      name=f"crawler-worker-{worker_id}", daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        logging.info(f"Crawling {len(regions)} regions with {num_workers} browser worker(s)")
+
+        running = num_workers
+        try:
+            while running:
+                kind, worker_id, region, payload = results.get()
+                if kind == 'result':
+                    yield region, payload, None
+                elif kind == 'error':
+                    yield region, [], payload
+                elif kind == 'worker_done':
+                    running -= 1
+        finally:
+            # Stop handing out regions if the caller bails out (e.g. KeyboardInterrupt)
+            self.stop_event.set()
+
+        # Every worker is gone - whatever is still queued could not be crawled
+        while True:
+            try:
+                region = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            yield region, [], "No browser worker available"
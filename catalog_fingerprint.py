@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Catalog fingerprinting - groups locales that serve the same pre-order catalog
+so that each storefront is only crawled once
+"""
+
+import hashlib
+from remove_duplicate_country_codes import dedupe_codes
+
+def fingerprint_product_ids(product_ids):
+    """Hash an ordered list of product IDs into a catalog fingerprint"""
+    if not product_ids:
+        return None
+    return hashlib.sha1("\n".join(product_ids).encode('utf-8')).hexdigest()
+
+def choose_representative(codes):
+    """Pick the locale to crawl for a group, preferring English like dedupe_codes does"""
+    english_codes = sorted(code for code in codes if code.startswith('en-'))
+    if english_codes:
+        return english_codes[0]
+    return sorted(codes)[0]
+
+def group_by_fingerprint(fingerprints):
+    """Group locales with identical fingerprints into {representative: [aliases]}"""
+    by_fingerprint = {}
+    for code, fingerprint in fingerprints.items():
+        if fingerprint:
+            by_fingerprint.setdefault(fingerprint, []).append(code)
+
+    groups = {}
+    for codes in by_fingerprint.values():
+        representative = choose_representative(codes)
+        groups[representative] = sorted(code for code in codes if code != representative)
+    return groups
+
+def build_crawl_plan(valid_codes, fingerprints):
+    """
+    Build the crawl plan {representative: [aliases]}.
+    Fingerprinted locales are grouped by catalog. Locales that could not be
+    fingerprinted (timeouts, empty catalogs) fall back to the one-per-country rule.
+    """
+    return complete_crawl_plan(group_by_fingerprint(fingerprints), valid_codes)
+
+def complete_crawl_plan(groups, valid_codes):
+    """
+    Add the valid locales no group covers (not fingerprinted, or validated since the
+    groups were built) to the crawl plan, one locale per country
+    """
+    plan = dict(groups)
+    covered = set(plan)
+    for aliases in plan.values():
+        covered.update(aliases)
+
+    for code in dedupe_codes(valid_codes):
+        if code not in covered:
+            plan[code] = []
+
+    return dict(sorted(plan.items()))
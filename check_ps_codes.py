@@ -1,4 +1,8 @@
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import REGION_CONFIG
 
 country_codes = [
     "ar-ae", "ar-bh", "ar-kw", "ar-lb", "ar-om", "ar-qa", "ar-sa", "bg-bg", "cs-cz", "da-dk", "de-at", "de-ch", "de-de",
@@ -17,21 +21,85 @@ country_codes = [
 
 base_url = "https://store.playstation.com/en-hk/category/3bf499d7-7acf-4931-97dd-2667494ee2c9/1/"
 
-valid_codes = []
+def create_session(pool_size):
+    """Create a keep-alive session whose connection pool can serve every worker at once"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def probe_code(session, code, timeout=None):
+    """
+    Check a single locale with a lightweight request.
+    Sends a HEAD first and falls back to a streamed GET that is closed as soon as the
+    status line arrives, so the full category page is never downloaded.
+    """
+    if timeout is None:
+        timeout = REGION_CONFIG['validation_timeout']
 
-for code in country_codes:
     url = base_url.replace("en-hk", code)
+    result = {'code': code, 'url': url, 'status': None, 'latency': None, 'valid': False, 'error': None}
+    start = time.perf_counter()
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            print(f"VALID: {code} -> {url}")
-            valid_codes.append(code)
-        else:
-            print(f"INVALID: {code} -> {url} (Status: {response.status_code})")
+        response = session.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code in (405, 501):
+            # Server does not support HEAD - read only the headers of a GET
+            response = session.get(url, timeout=timeout, stream=True)
+            response.close()
+        result['status'] = response.status_code
+        result['valid'] = response.status_code == 200
     except Exception as e:
-        print(f"ERROR: {code} -> {url} ({e})")
+        result['error'] = str(e)
+    result['latency'] = time.perf_counter() - start
+    return result
+
+def check_codes(codes=None, max_workers=None, timeout=None):
+    """Probe locales concurrently and return a {code: result} dict with status and latency"""
+    if codes is None:
+        codes = country_codes
+    if max_workers is None:
+        max_workers = REGION_CONFIG['validation_workers']
+
+    results = {}
+    with create_session(max_workers) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(probe_code, session, code, timeout) for code in codes]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['code']] = result
+    return results
+
+def validate_codes(codes=None, verbose=True, max_workers=None, timeout=None):
+    """Probe each locale's pre-order category page and return the codes that respond with 200"""
+    if codes is None:
+        codes = country_codes
+
+    results = check_codes(codes, max_workers=max_workers, timeout=timeout)
+
+    valid_codes = []
+    # Report in the original order rather than completion order
+    for code in codes:
+        result = results[code]
+        if result['valid']:
+            valid_codes.append(code)
+        if verbose:
+            latency_ms = result['latency'] * 1000
+            if result['valid']:
+                print(f"VALID: {code} -> {result['url']} ({latency_ms:.0f} ms)")
+            elif result['error']:
+                print(f"ERROR: {code} -> {result['url']} ({result['error']})")
+            else:
+                print(f"INVALID: {code} -> {result['url']} (Status: {result['status']})")
+
+    return valid_codes
 
-print("\nValid codes:")
-print(valid_codes)
-print(len(valid_codes))
+if __name__ == "__main__":
+    start = time.perf_counter()
+    valid_codes = validate_codes()
+    elapsed = time.perf_counter() - start
 
+    print("\nValid codes:")
+    print(valid_codes)
+    print(len(valid_codes))
+    print(f"Checked {len(country_codes)} codes in {elapsed:.1f}s")
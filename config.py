@@ -37,12 +37,94 @@ def get_db_config():
 # For backward compatibility
 DB_CONFIG = get_db_config()
 
+# Connection pool shared by every database manager (see db_pool.py)
+DB_POOL_CONFIG = {
+    'pool_name': 'ps_crawler',
+    'pool_size': 8,  # connections opened once per process; each thread using a manager holds one
+    'checkout_timeout': 30,  # seconds to wait for a free connection before giving up
+    'reconnect_attempts': 3  # attempts to revive a pooled connection the server dropped
+}
+
+# Write-behind buffer for region snapshots (see write_behind.py)
+DB_WRITE_CONFIG = {
+    'batch_size': 20,  # rows (regions and their aliases) written per executemany / transaction
+    'flush_interval': 10,  # seconds a snapshot may wait for its batch to fill up
+    'max_attempts': 5,  # tries per batch before its regions are reported failed
+    'retry_backoff': 2,  # seconds before the first retry, doubled after every failure
+    'spool_file': 'result_spool.db',  # SQLite spool of snapshots written while MySQL was unreachable (see result_spool.py)
+    'reconnect_interval': 60,  # seconds between tries to write to MySQL again while spooling
+    'close_timeout': 300  # seconds the end of a run waits for the buffered snapshots to be written
+}
+
 # Crawler Configuration
 CRAWLER_CONFIG = {
-    'request_delay': 2,  # seconds between requests
-    'max_retries': 3,
+    'request_delay': 2,  # deprecated - only main_crawler_test.py / main_crawler_backup.py sleep for it; pacing is requests_per_second and rate_* below
+    'max_retries': 3,  # attempts per page before a region is reported incomplete
+    'retry_backoff_base': 2,  # seconds before the first page retry, doubled on every further attempt
+    'retry_backoff_max': 30,  # cap on the backoff between page retries
     'timeout': 30,
-    'implicit_wait': 10
+    'implicit_wait': 10,
+    'page_load_timeout': 60,  # seconds before a navigation counts as stalled and the driver is recreated
+    'driver_recycle_pages': 300,  # recreate each Chrome after this many pages to cap memory growth (0 disables)
+    'driver_max_rss_mb': 1500,  # recreate Chrome when it uses more memory than this (needs psutil, 0 disables)
+    'driver_rss_check_every': 10,  # pages between memory checks
+    'store_base_url': 'https://store.playstation.com',
+    'fetch_mode': 'auto',  # 'auto' tries plain HTTP first and falls back to Selenium per page, 'selenium' always uses the browser
+    'http_pool_size': 4,  # keep-alive connections for the HTTP fast path
+    'page_fanout_workers': 4,  # pages of one region fetched concurrently once page 1 gives the page count (1 disables)
+    'concurrency_mode': 'browsers',  # 'browsers' runs browser_workers Chrome instances, 'tabs' runs tabs_per_browser tabs in one Chrome
+    'browser_workers': 3,  # parallel Chrome instances, each crawling its own regions
+    'tabs_per_browser': 4,  # navigations kept in flight in 'tabs' mode
+    'tab_poll_interval': 0.2,  # seconds between passes over the open tabs
+    'pipeline_queue_size': 4,  # crawled regions waiting for the database writer before the crawl blocks
+    'requests_per_second': 1.5,  # starting page request rate across all workers (shared adaptive rate limiter)
+    'rate_limit_burst': 3,  # requests that may go out back to back after an idle period
+    'rate_limit_min': 0.2,  # the limiter never backs off below this many requests per second
+    'rate_limit_max': 5,  # ...and never speeds up beyond this
+    'rate_increase_step': 0.05,  # requests/sec added for every page served within rate_healthy_latency
+    'rate_healthy_latency': 5,  # seconds - slower pages do not raise the rate
+    'rate_decrease_factor': 0.5,  # rate multiplier on a throttling signal (timeout, empty page, 429/403, challenge)
+    'rate_decrease_cooldown': 10,  # seconds before another throttling signal can cut the rate again
+    'readiness_stable_for': 0.5,  # seconds the tile count must stay unchanged before a partial page counts as ready
+    'readiness_poll_interval': 0.1,  # seconds between readiness checks
+    'readiness_log_file': 'readiness_latency.jsonl',  # per-page readiness latency, for tuning timeouts
+    'extraction_mode': 'js',  # 'js' collects tiles in the browser with one script call, 'soup' parses page_source with the parser backend
+    'verify_extraction': False,  # in 'js' mode, also parse page_source and log any disagreement
+    'parser_backend': 'auto',  # 'auto', 'selectolax', 'lxml', 'bs4-strained' or 'bs4' - see parser_backends.py
+    'parse_workers': 'auto',  # processes that parse page HTML off the browser threads ('auto': one per spare core up to 4, 0 parses in the calling thread)
+    'checkpoint_file': 'crawl_checkpoint.db',  # SQLite record of today's finished regions and pages, for --resume
+    'metrics_dir': 'metrics',  # per-stage timing histograms of each run (JSON per day + Prometheus text file)
+    'profile_dir': 'profiles',  # --profile: per-region cProfile dumps and the merged summary, one folder per run
+    'profile_top_n': 30  # --profile: functions listed in the merged hot-function summary
+}
+
+# Network Blocking Configuration
+# Chrome DevTools (CDP) request blocking - tiles still render, but pages move far fewer bytes
+NETWORK_BLOCKING_CONFIG = {
+    'enabled': True,
+    'resource_types': {  # URL patterns blocked per resource type
+        'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*image.api.playstation.com*'],
+        'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+        'media': ['*.mp4', '*.webm', '*.m3u8', '*.mp3']
+    },
+    'blocked_types': ['image', 'font', 'media'],  # which of the resource types above to block
+    'blocked_domains': [  # analytics / tracking hosts
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*adobedtm.com*', '*omtrdc.net*', '*demdex.net*', '*facebook.net*', '*onetrust.com*'
+    ],
+    'record_page_weight': True  # add bytes transferred per page to the readiness log
+}
+
+# Region Registry Configuration
+# Validated locale codes are cached on disk and only re-probed once the cache is older than the TTL
+REGION_CONFIG = {
+    'cache_file': 'region_cache.json',
+    'cache_ttl_hours': 168,  # re-validate region codes once a week
+    'validation_workers': 16,  # concurrent probes when re-validating
+    'validation_timeout': 10,  # seconds per probe
+    'catalog_dedup': True,  # crawl one locale per identical pre-order catalog and alias the rest
+    'fingerprint_ttl_hours': 168,  # re-fingerprint catalogs once a week
+    'empty_region_ttl_hours': 72  # skip storefronts confirmed to have no pre-orders for this long
 }
 
 # Logging Configuration
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Staged crawl pipeline - region results flow from the crawl stage (browser workers or tabs,
+which fetch and extract every page) to a single database writer through a bounded queue.
+Crawling keeps going while the writer commits, and a writer that falls behind blocks the
+crawl instead of letting finished regions pile up in memory.
+"""
+
+import queue
+import logging
+import threading
+from config import CRAWLER_CONFIG
+from stage_metrics import stage_metrics
+
+_DONE = object()
+
+class CrawlPipeline:
+    def __init__(self, queue_size=None):
+        """queue_size: finished regions buffered between the crawl and the writer (defaults to CRAWLER_CONFIG['pipeline_queue_size'])"""
+        self.queue_size = max(1, queue_size or CRAWLER_CONFIG['pipeline_queue_size'])
+        self.stop_event = threading.Event()
+
+    def _put(self, handoff, item):
+        """Block while the writer is behind, but give up once the pipeline is stopping"""
+        while not self.stop_event.is_set():
+            try:
+                handoff.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _crawl_stage(self, results, handoff, failure):
+        """Producer thread - drains the crawl generator into the bounded queue"""
+        try:
+            for item in results:
+                with stage_metrics.time('pipeline_backpressure', item[0]):
+                    if not self._put(handoff, item):
+                        break
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            # Closing the generator stops the browser workers / tabs behind it
+            close = getattr(results, 'close', None)
+            if close:
+                close()
+            self._put(handoff, _DONE)
+
+    def run(self, results, write):
+        """
+        Run the pipeline until every region has been written.
+        results: iterable of (region, games, error), e.g. BrowserWorkerPool.crawl(regions);
+                 consumed on a crawl-stage thread
+        write: callable(region, games, error) - the writer stage, run on the calling thread
+        Errors raised by the crawl stage are re-raised here once the queue is drained.
+        """
+        self.stop_event.clear()
+        handoff = queue.Queue(maxsize=self.queue_size)
+        failure = []
+        crawler_thread = threading.Thread(target=self._crawl_stage, args=(results, handoff, failure),
+                                          name="crawl-stage", daemon=True)
+        crawler_thread.start()
+        try:
+            while True:
+                item = handoff.get()
+                if item is _DONE:
+                    break
+                write(*item)
+        finally:
+            self.stop_event.set()
+            crawler_thread.join(timeout=CRAWLER_CONFIG['timeout'])
+            if crawler_thread.is_alive():
+                logging.warning("Crawl stage still busy after the pipeline stopped - leaving it to exit on its own")
+        if failure:
+            raise failure[0]
@@ -1,56 +1,42 @@
-import mysql.connector
 from mysql.connector import Error
 import logging
 import json
 from datetime import date
-from config import DB_CONFIG
+from db_pool import PooledConnection
 
-class DatabaseManager:
-    def __init__(self):
-        self.connection = None
-        self.cursor = None
-        
+# Insert or update if same date/region already exists
+INSERT_SNAPSHOT_QUERY = """
+    INSERT INTO preorder_games (crawl_date, region, game_info)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE game_info = VALUES(game_info)
+"""
+
+def game_info_json(games_data):
+    """The game_info column value for a region: its games as a JSON list of names and ranks"""
+    return json.dumps([{"game_name": game['game_name'], "display_rank": game['display_rank']} for game in games_data])
+
+class DatabaseManager(PooledConnection):
     def connect(self):
-        """Establish connection to MySQL database"""
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            self.cursor = self.connection.cursor()
-            logging.info("Successfully connected to MySQL database")
-            return True
-        except Error as e:
-            logging.error(f"Error connecting to MySQL: {e}")
+        """Check out a pooled MySQL connection for the calling thread"""
+        if not self.checkout():
             return False
+        logging.info("Successfully connected to MySQL database")
+        return True
     
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Return this manager's connections to the shared pool"""
+        self.release_all()
         logging.info("MySQL connection closed")
     
     def insert_games_for_region(self, region, games_data):
         """Insert all games for a region as JSON in a single row"""
         try:
-            # Convert games list to JSON format
-            game_info = []
-            for game in games_data:
-                game_info.append({
-                    "game_name": game['game_name'],
-                    "display_rank": game['display_rank']
-                })
-            
-            game_info_json = json.dumps(game_info)
-            today = date.today()
-            
-            # Insert or update if same date/region already exists
-            query = """
-                INSERT INTO preorder_games (crawl_date, region, game_info)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE game_info = VALUES(game_info)
-            """
-            values = (today, region, game_info_json)
-            self.cursor.execute(query, values)
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    return False
+            
+            values = (date.today(), region, game_info_json(games_data))
+            self.cursor.execute(INSERT_SNAPSHOT_QUERY, values)
             self.connection.commit()
             
             logging.info(f"Successfully inserted {len(games_data)} games for region {region}")
@@ -58,7 +44,41 @@ class DatabaseManager:
             
         except Error as e:
             logging.error(f"Error inserting games for {region}: {e}")
-            self.connection.rollback()
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def insert_snapshots(self, snapshots):
+        """
+        Insert several regions' games for today with one executemany in a single transaction.
+        snapshots: [(region, games_data)]. Returns True if the whole batch was committed.
+        """
+        today = date.today()
+        return self.insert_rows([(today, region, game_info_json(games_data)) for region, games_data in snapshots])
+    
+    def insert_rows(self, rows):
+        """
+        Insert preorder_games rows [(crawl_date, region, game_info JSON)] with one executemany
+        in a single transaction. Returns True if the whole batch was committed.
+        """
+        try:
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    return False
+            
+            self.cursor.executemany(INSERT_SNAPSHOT_QUERY, rows)
+            self.connection.commit()
+            
+            logging.info(f"Successfully inserted a batch of {len(rows)} region snapshots")
+            return True
+            
+        except Error as e:
+            logging.error(f"Error inserting a batch of {len(rows)} region snapshots: {e}")
+            if self.connection:
+                try:
+                    self.connection.rollback()
+                except Error:
+                    pass
             return False
     
     def get_games_by_region(self, region, crawl_date=None):
@@ -181,12 +201,11 @@ class DatabaseManager:
             return {}
     
     def test_connection(self):
-        """Test database connection"""
+        """Test database connection (the checked-out connection is kept for this thread)"""
         try:
             if self.connect():
                 self.cursor.execute("SELECT 1")
                 result = self.cursor.fetchone()
-                self.disconnect()
                 return result is not None
             return False
         except Error as e:
@@ -1,37 +1,29 @@
-import mysql.connector
 from mysql.connector import Error
 import logging
 import json
 from datetime import date
-from config import DB_CONFIG
+from db_pool import PooledConnection
 
-class DatabaseManagerTest:
-    def __init__(self):
-        self.connection = None
-        self.cursor = None
-        
+class DatabaseManagerTest(PooledConnection):
     def connect(self):
-        """Establish connection to MySQL database"""
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            self.cursor = self.connection.cursor()
-            logging.info("Successfully connected to MySQL database (TEST MODE)")
-            return True
-        except Error as e:
-            logging.error(f"Error connecting to MySQL: {e}")
+        """Check out a pooled MySQL connection for the calling thread"""
+        if not self.checkout():
             return False
+        logging.info("Successfully connected to MySQL database (TEST MODE)")
+        return True
     
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Return this manager's connections to the shared pool"""
+        self.release_all()
         logging.info("MySQL connection closed (TEST MODE)")
     
     def insert_games_for_region(self, region, games_data):
         """Insert all games for a region as JSON in a single row (TEST TABLE)"""
         try:
+            if not self.connection or not self.cursor:
+                if not self.connect():
+                    return False
+            
             # Convert games list to JSON format
             game_info = []
             for game in games_data:
@@ -58,7 +50,8 @@ class DatabaseManagerTest:
             
         except Error as e:
             logging.error(f"Error inserting games for {region} (TEST TABLE): {e}")
-            self.connection.rollback()
+            if self.connection:
+                self.connection.rollback()
             return False
     
     def get_games_by_region(self, region, crawl_date=None):
@@ -181,12 +174,11 @@ class DatabaseManagerTest:
             return {}
     
     def test_connection(self):
-        """Test database connection"""
+        """Test database connection (the checked-out connection is kept for this thread)"""
         try:
             if self.connect():
                 self.cursor.execute("SELECT 1")
                 result = self.cursor.fetchone()
-                self.disconnect()
                 return result is not None
             return False
         except Error as e:
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shared MySQL connection pool - DatabaseManager, DatabaseManagerTest and GameTrackingManager
+check connections out of one mysql.connector pool per process, configured from
+get_db_config(). Every thread gets its own pooled connection and cursor, so crawl workers,
+the writer and the tracking updater can use the same manager at once without reconnecting.
+"""
+
+import time
+import logging
+import threading
+from mysql.connector import pooling, Error
+from mysql.connector.errors import PoolError
+from config import get_db_config, DB_POOL_CONFIG
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_connection_pool():
+    """The process-wide pool, created (and its connections opened) on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(pool_name=DB_POOL_CONFIG['pool_name'],
+                                                pool_size=DB_POOL_CONFIG['pool_size'],
+                                                pool_reset_session=True,
+                                                **get_db_config())
+            logging.info(f"MySQL connection pool '{DB_POOL_CONFIG['pool_name']}' opened "
+                         f"with {DB_POOL_CONFIG['pool_size']} connections")
+        return _pool
+
+def checkout_connection(timeout=None):
+    """
+    Take a connection from the pool, waiting up to timeout seconds while every connection
+    is in use. Raises mysql.connector.Error if none becomes free or the pool cannot be opened.
+    """
+    timeout = DB_POOL_CONFIG['checkout_timeout'] if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    pool = get_connection_pool()
+    while True:
+        try:
+            return pool.get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+class PooledConnection:
+    """
+    Base for the database managers - self.connection and self.cursor belong to the calling
+    thread and are checked out of the shared pool by checkout()
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._checked_out = []
+        self._checked_out_lock = threading.Lock()
+
+    @property
+    def connection(self):
+        return getattr(self._local, 'connection', None)
+
+    @property
+    def cursor(self):
+        return getattr(self._local, 'cursor', None)
+
+    def checkout(self):
+        """
+        Give the calling thread a pooled connection and cursor; a thread that already has one
+        keeps it (reconnecting if the server dropped it). Returns False if no connection is available.
+        """
+        connection = self.connection
+        if connection is not None:
+            try:
+                if not connection.is_connected():
+                    connection.reconnect(attempts=DB_POOL_CONFIG['reconnect_attempts'], delay=1)
+                    self._local.cursor = connection.cursor()
+                return True
+            except Error as e:
+                logging.warning(f"Pooled MySQL connection lost and could not reconnect: {e}")
+                self._release(connection)
+
+        try:
+            connection = checkout_connection()
+        except Error as e:
+            logging.error(f"Error connecting to MySQL: {e}")
+            return False
+        self._local.connection = connection
+        self._local.cursor = connection.cursor()
+        with self._checked_out_lock:
+            self._checked_out.append(connection)
+        return True
+
+    def _release(self, connection):
+        """Return one connection to the pool"""
+        with self._checked_out_lock:
+            if connection in self._checked_out:
+                self._checked_out.remove(connection)
+        if self.connection is connection:
+            self._local.connection = self._local.cursor = None
+        try:
+            # close() on a pooled connection hands it back to the pool
+            connection.close()
+        except Error as e:
+            logging.debug(f"Error returning a MySQL connection to the pool: {e}")
+
+    def release_all(self):
+        """Return every connection this manager checked out, from any thread, to the pool"""
+        with self._checked_out_lock:
+            connections, self._checked_out = self._checked_out, []
+        # Threads that still hold a reference check out a fresh connection next time
+        self._local = threading.local()
+        for connection in connections:
+            try:
+                connection.close()
+            except Error as e:
+                logging.debug(f"Error returning a MySQL connection to the pool: {e}")
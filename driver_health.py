@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+WebDriver health supervision - decides when a crawler's Chrome should be replaced:
+a dead or hung session, Chrome's memory above a threshold, or simply after a number
+of pages so slow leaks never build up over a long run
+"""
+
+import logging
+from config import CRAWLER_CONFIG
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_warned_no_psutil = False
+
+def probe_driver(driver):
+    """
+    Local health check for a new session - loads about:blank and runs a script, without
+    touching the network. Returns the browser version; raises if the session cannot
+    navigate or execute JavaScript.
+    """
+    driver.get("about:blank")
+    if driver.execute_script("return 1 + 1;") != 2:
+        raise RuntimeError("JavaScript capability probe returned an unexpected result")
+    return driver.capabilities.get('browserVersion', 'unknown')
+
+def is_driver_alive(driver):
+    """True if the session still answers a trivial command"""
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except Exception:
+        return False
+
+def chrome_rss_mb(driver):
+    """
+    Resident memory of chromedriver and every Chrome process under it, in MB.
+    Returns None when psutil is not installed or the processes cannot be inspected.
+    """
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+class DriverSupervisor:
+    """
+    Per-driver health bookkeeping. The crawler asks restart_reason() before each navigation
+    and calls page_loaded() after it; a non-None reason means the driver should be recreated.
+    """
+
+    def __init__(self, recycle_pages=None, max_rss_mb=None, rss_check_every=None):
+        self.recycle_pages = recycle_pages if recycle_pages is not None else CRAWLER_CONFIG['driver_recycle_pages']
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else CRAWLER_CONFIG['driver_max_rss_mb']
+        self.rss_check_every = rss_check_every or CRAWLER_CONFIG['driver_rss_check_every']
+        self.pages = 0
+        self.restarts = 0
+        if self.max_rss_mb and psutil is None:
+            global _warned_no_psutil
+            if not _warned_no_psutil:
+                logging.warning(f"driver_max_rss_mb is {self.max_rss_mb} but psutil is not installed - Chrome memory "
+                                f"will not be monitored (pip install psutil)")
+                _warned_no_psutil = True
+
+    def page_loaded(self):
+        self.pages += 1
+
+    def driver_restarted(self):
+        self.pages = 0
+        self.restarts += 1
+
+    def restart_reason(self, driver):
+        """Why the driver should be recreated before the next page, or None if it is healthy"""
+        if self.recycle_pages and self.pages >= self.recycle_pages:
+            return f"recycling after {self.pages} pages"
+        if self.max_rss_mb and self.pages and self.pages % self.rss_check_every == 0:
+            rss = chrome_rss_mb(driver)
+            if rss is not None and rss > self.max_rss_mb:
+                return f"Chrome using {rss:.0f} MB (limit {self.max_rss_mb} MB)"
+        return None
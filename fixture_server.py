@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Local fixture server that imitates PlayStation Store pre-order category pages
+so fetch modes can be exercised offline
+
+Each fixture region is rendered in one of three styles:
+  'ssr'   - product tiles are in the server-rendered HTML
+  'state' - tiles are only in the embedded __NEXT_DATA__ page state
+  'csr'   - an empty shell whose tiles are injected by JavaScript (needs a browser)
+
+The server can also replay recorded pages (see load_recorded_pages) and add a
+configurable per-response latency to imitate the live store.
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from page_parser import GAMES_PER_PAGE, CATEGORY_ID
+
+# region -> (total pre-order games, render style)
+DEFAULT_FIXTURE_REGIONS = {
+    'en-us': (90, 'ssr'),
+    'en-gb': (50, 'ssr'),
+    'ja-jp': (30, 'state'),
+    'en-hk': (24, 'csr'),
+    'en-is': (0, 'ssr')
+}
+
+PATH_PATTERN = re.compile(r'^/([a-z-]+)/category/([0-9a-f-]+)/(\d+)/?$')
+
+FILLER_BLOCKS = 3000  # ~1 MB of non-tile markup, roughly what a live category page carries
+
+def fixture_product_id(region, index):
+    """Deterministic fake product ID for the index-th game of a region"""
+    return f"UP{index % 9000:04d}-PPSA{index:05d}_00-{region.replace('-', '').upper()}PREORDER{index:04d}"
+
+def page_product_ids(region, total_games, page_num):
+    """Product IDs shown on a given page of a fixture region"""
+    start = (page_num - 1) * GAMES_PER_PAGE
+    end = min(start + GAMES_PER_PAGE, total_games)
+    return [fixture_product_id(region, index) for index in range(start, end)]
+
+def render_tile(page_index, product_id):
+    """Render one product tile the way the store marks it up"""
+    telemetry = json.dumps({'id': product_id, 'index': page_index, 'name': f"Game {product_id[-4:]}"})
+    return (
+        f'<li><div data-qa="ems-sdk-grid#productTile{page_index}" data-qa-index="{page_index}">'
+        f"<a href=\"/product/{product_id}\" data-telemetry-meta='{telemetry}'>"
+        f'<span data-qa="ems-sdk-grid#productTile{page_index}#product-name">Game {product_id[-4:]}</span>'
+        f'</a></div></li>'
+    )
+
+def render_pagination(total_pages):
+    """Render the numbered pagination buttons"""
+    if total_pages <= 1:
+        return ''
+    buttons = ''.join(f'<button>{page}</button>' for page in range(1, total_pages + 1))
+    return f'<nav data-qa="ems-sdk-grid#ems-sdk-top-paginator-root">{buttons}</nav>'
+
+def render_page(region, total_games, style, page_num):
+    """Render a full category page for a fixture region"""
+    product_ids = page_product_ids(region, total_games, page_num)
+    total_pages = max(1, -(-total_games // GAMES_PER_PAGE))
+    tiles = ''.join(render_tile(index, product_id) for index, product_id in enumerate(product_ids))
+
+    grid = f'<ul class="psw-grid-list">{tiles}</ul>' if tiles else '<p data-qa="ems-sdk-grid#no-results">No results</p>'
+
+    if style == 'ssr':
+        return (
+            f'<html><head><title>Pre-Order - {region}</title></head><body><main>'
+            f'{grid}{render_pagination(total_pages)}</main></body></html>'
+        )
+
+    if style == 'state':
+        state = {
+            'props': {'apolloState': {
+                f'CategoryGrid:{CATEGORY_ID}:{region}:{page_num}': {
+                    'products': [{'__ref': f'Product:{product_id}:{region}'} for product_id in product_ids],
+                    'pageInfo': {'totalCount': total_games, 'offset': (page_num - 1) * GAMES_PER_PAGE,
+                                 'size': GAMES_PER_PAGE, 'isLast': page_num >= total_pages}
+                }
+            }}
+        }
+        return (
+            f'<html><head><title>Pre-Order - {region}</title></head><body><main id="root"></main>'
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+            f'</body></html>'
+        )
+
+    # 'csr' - only a browser that runs the script sees the tiles
+    markup = json.dumps(f'{grid}{render_pagination(total_pages)}')
+    return (
+        f'<html><head><title>Pre-Order - {region}</title></head><body><main id="root"></main>'
+        f'<script>setTimeout(function () {{ document.getElementById("root").innerHTML = {markup}; }}, 50);</script>'
+        f'</body></html>'
+    )
+
+def filler_markup():
+    """Navigation, footer and script noise that every real store page carries"""
+    block = ('<div class="psw-l-line-left"><a href="/en-us/pages/latest" data-track="nav">Latest</a>'
+             '<span class="psw-t-body">Deals and offers</span><svg><path d="M0 0h24v24H0z"/></svg></div>')
+    return f'<header>{block * (FILLER_BLOCKS // 2)}</header>', f'<footer>{block * (FILLER_BLOCKS // 2)}</footer>'
+
+def pad_to_live_weight(html):
+    """Wrap a fixture page's <main> in header/footer markup so it weighs about what a live page does"""
+    header, footer = filler_markup()
+    return html.replace('<main', f'{header}<main', 1).replace('</main>', f'</main>{footer}', 1)
+
+def record_fixture_pages(regions, padded=True):
+    """{(region, page_num): html} for every page of the given fixture regions, as if recorded from the store"""
+    pages = {}
+    for region, (total_games, style) in regions.items():
+        total_pages = max(1, -(-total_games // GAMES_PER_PAGE))
+        for page_num in range(1, total_pages + 1):
+            html = render_page(region, total_games, style, page_num)
+            pages[(region, page_num)] = pad_to_live_weight(html) if padded else html
+    return pages
+
+def load_recorded_pages(directory):
+    """
+    {(region, page_num): html} from a directory of recorded pages named <region>_<page>.html
+    (e.g. en-us_1.html), such as page_source dumps from a real crawl
+    """
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        region, _, page = name.rpartition('_')
+        if not region or not page.isdigit():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[(region, int(page))] = f.read()
+    return pages
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Serves fixture category pages; configured through the server instance"""
+
+    def do_GET(self):
+        self.server.request_times.append(time.time())
+        match = PATH_PATTERN.match(self.path)
+        if not match:
+            self.send_error(404)
+            return
+
+        region, page_num = match.group(1), int(match.group(3))
+        recorded = self.server.recorded_pages
+        if recorded is not None:
+            html = recorded.get((region, page_num))
+        elif region in self.server.fixture_regions:
+            total_games, style = self.server.fixture_regions[region]
+            html = render_page(region, total_games, style, page_num)
+        else:
+            html = None
+        if html is None:
+            self.send_error(404)
+            return
+
+        if self.server.latency or self.server.jitter:
+            # Each request sleeps on its own handler thread, so concurrent requests overlap like on the live store
+            time.sleep(self.server.latency + random.uniform(0, self.server.jitter))
+        body = html.encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        match = PATH_PATTERN.match(self.path)
+        self.send_response(200 if match and match.group(1) in self.server.served_regions() else 404)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def served_regions(self):
+        if self.recorded_pages is not None:
+            return {region for region, _ in self.recorded_pages}
+        return set(self.fixture_regions)
+
+def start_fixture_server(regions=None, host='127.0.0.1', port=0, recorded_pages=None, latency=0.0, jitter=0.0):
+    """
+    Start the fixture server on a background thread and return (server, base_url)
+
+    regions: {region: (total games, render style)} rendered on the fly
+    recorded_pages: {(region, page_num): html} to replay instead of rendering
+    latency, jitter: seconds each response is delayed by (latency + uniform(0, jitter))
+    """
+    server = FixtureServer((host, port), FixtureRequestHandler)
+    server.fixture_regions = regions or DEFAULT_FIXTURE_REGIONS
+    server.recorded_pages = recorded_pages
+    server.latency = latency
+    server.jitter = jitter
+    # Wall-clock arrival time of every GET, for latency benchmarks across processes
+    server.request_times = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    server, base_url = start_fixture_server(port=8765)
+    print(f"🧪 Fixture store running at {base_url}")
+    for region, (total_games, style) in DEFAULT_FIXTURE_REGIONS.items():
+        print(f"   {base_url}/{region}/category/{CATEGORY_ID}/1  ({total_games} games, {style})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
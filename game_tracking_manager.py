@@ -3,36 +3,24 @@
 Game tracking manager for updating PS_games table during daily crawler runs
 """
 
-import mysql.connector
 from mysql.connector import Error
 import json
 import logging
 from datetime import datetime, date
-from config import DB_CONFIG
+from db_pool import PooledConnection
 from game_tracking_config import get_tracked_games, get_tracked_regions, TRACKING_TABLE_NAME
 
-class GameTrackingManager:
-    def __init__(self):
-        self.connection = None
-        self.cursor = None
-        
+class GameTrackingManager(PooledConnection):
     def connect(self):
-        """Establish connection to MySQL database"""
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            self.cursor = self.connection.cursor()
-            logging.info("Game tracking manager connected to database")
-            return True
-        except Error as e:
-            logging.error(f"Error connecting to database: {e}")
+        """Check out a pooled MySQL connection for the calling thread"""
+        if not self.checkout():
             return False
+        logging.info("Game tracking manager connected to database")
+        return True
     
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Return this manager's connections to the shared pool"""
+        self.release_all()
         logging.info("Game tracking manager disconnected")
     
     def update_game_tracking(self, region, games_data):
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+HTTP-only fast path - fetches category pages with a pooled requests session
+and extracts product tiles from the server-rendered response without Selenium
+"""
+
+import time
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from config import CRAWLER_CONFIG
+from page_parser import build_page_url, is_challenge_page
+from parse_pool import parse_pool
+from rate_limiter import get_shared_rate_limiter
+from stage_metrics import stage_metrics
+
+# Responses the store uses to push back on request volume
+THROTTLE_STATUS_CODES = (403, 429)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+class HttpPageFetcher:
+    def __init__(self, rate_limiter=None, pool_size=None):
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        pool_size = pool_size or CRAWLER_CONFIG['http_pool_size']
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+
+    def fetch_html(self, region, page_num):
+        """Download the raw HTML of a category page, or None on any HTTP or network error"""
+        url = build_page_url(region, page_num)
+        try:
+            response = self.session.get(url, timeout=CRAWLER_CONFIG['timeout'])
+        except requests.Timeout as e:
+            logging.warning(f"HTTP fetch timed out for {url}: {e}")
+            self.rate_limiter.report_throttle("HTTP timeout")
+            return None
+        except requests.RequestException as e:
+            logging.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.rate_limiter.report_throttle(f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            logging.warning(f"HTTP fetch for {url} returned status {response.status_code}")
+            return None
+        if is_challenge_page(response.text):
+            logging.warning(f"HTTP fetch for {url} returned a challenge page")
+            self.rate_limiter.report_throttle("challenge page")
+            return None
+        return response.text
+
+    def fetch_page(self, region, page_num):
+        """
+        Fetch and parse one category page over plain HTTP.
+        Returns the parsed page (see page_parser.make_page), or None if the request failed.
+        A page with tile_count == 0 means the tiles are rendered client-side only.
+        """
+        logging.info(f"Fetching {region} - Page {page_num} over HTTP")
+        stage_metrics.observe('rate_limit_wait', self.rate_limiter.acquire(), region)
+        start = time.monotonic()
+        html = self.fetch_html(region, page_num)
+        latency = time.monotonic() - start
+        stage_metrics.observe('http_fetch', latency, region)
+        if html is None:
+            return None
+        with stage_metrics.time('parse', region):
+            page = parse_pool.parse_html(html, region, page_num)
+        if page['tile_count']:
+            self.rate_limiter.report_success(latency)
+        return page
+
+    def close(self):
+        """Close the pooled session"""
+        self.session.close()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+In-page tile extraction - one execute_script call collects a compact list of
+{index, telemetry_id, name} records in the browser, instead of shipping the full
+serialized DOM through page_source and re-parsing it with BeautifulSoup
+"""
+
+import logging
+from page_parser import make_page, games_from_tile_records
+
+EXTRACT_TILES_SCRIPT = """
+const tiles = [];
+for (const tile of document.querySelectorAll("div[data-qa*='productTile'][data-qa-index]")) {
+    if (!/productTile\\d+/.test(tile.getAttribute('data-qa'))) {
+        continue;
+    }
+    const record = {index: parseInt(tile.getAttribute('data-qa-index'), 10) || 0, telemetry_id: null, name: null, error: null};
+    const link = tile.querySelector('a');
+    const meta = link ? link.getAttribute('data-telemetry-meta') : null;
+    if (!link) {
+        record.error = 'no_link';
+    } else if (!meta) {
+        record.error = 'no_meta';
+    } else {
+        try {
+            const data = JSON.parse(meta);
+            record.telemetry_id = data.id || '';
+            record.name = data.name || null;
+        } catch (e) {
+            record.error = 'bad_json';
+        }
+    }
+    tiles.push(record);
+}
+let maxPage = null;
+for (const el of document.querySelectorAll('button, a')) {
+    const text = el.textContent.trim();
+    if (/^\\d+$/.test(text)) {
+        maxPage = Math.max(maxPage || 0, parseInt(text, 10));
+    }
+}
+return {tiles: tiles, max_page: maxPage};
+"""
+
+def extract_page_with_js(driver, region, page_num, source='selenium-js'):
+    """
+    Extract the current page's tiles and pagination inside the browser.
+    Returns the parsed page, or None if the script failed so the caller can fall back.
+    """
+    try:
+        result = driver.execute_script(EXTRACT_TILES_SCRIPT)
+    except Exception as e:
+        logging.warning(f"In-page extraction failed for {region} page {page_num}: {e}")
+        return None
+    if not result or not result.get('tiles'):
+        return None
+
+    records = result['tiles']
+    max_page = result.get('max_page')
+    if max_page is not None:
+        max_page = max(page_num, max_page)
+    return make_page(games_from_tile_records(records, region, page_num), len(records), max_page, source)
+
+def pages_match(page, other):
+    """Check that two extractions of the same page produced identical records"""
+    def records(p):
+        return [(game['game_name'], game['display_rank']) for game in p['games']]
+    return records(page) == records(other) and page['max_page'] == other['max_page']
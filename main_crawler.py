@@ -1,29 +1,32 @@
+import sys
 import logging
-import time
-import re
-import json
+import argparse
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from bs4 import BeautifulSoup
-
 from database_utils import DatabaseManager
-from config import CRAWLER_CONFIG, LOG_CONFIG, EMAIL_CONFIG
-from remove_duplicate_country_codes import unique_codes
+from config import CRAWLER_CONFIG, LOG_CONFIG, EMAIL_CONFIG, REGION_CONFIG
+from region_registry import RegionRegistry, empty_region_cache
+from remove_duplicate_country_codes import dedupe_codes
+from catalog_fingerprint import build_crawl_plan, complete_crawl_plan
+from region_crawler import RegionCrawler
+from browser_pool import BrowserWorkerPool
+from multi_tab import MultiTabCrawler
+from page_readiness import readiness_recorder
+from run_checkpoint import RunCheckpoint
+from stage_metrics import stage_metrics
+from region_profiler import region_profiler
+from crawl_pipeline import CrawlPipeline
+from parse_pool import parse_pool
+from write_behind import WriteBehindBuffer
+from result_spool import ResultSpool
 
-class PlayStationCrawler:
+class PlayStationCrawler(RegionCrawler):
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.setup_logging()
-        self.setup_driver()
+        super().__init__()
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -36,57 +39,6 @@ class PlayStationCrawler:
             ]
         )
         
-    def setup_driver(self):
-        """Setup Chrome WebDriver with optimized options using local ChromeDriver"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in background
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-logging")
-        chrome_options.add_argument("--disable-in-process-stack-traces")
-        chrome_options.add_argument("--disable-webgl")
-        chrome_options.add_argument("--disable-3d-apis")
-        chrome_options.add_argument("--disable-accelerated-2d-canvas")
-        chrome_options.add_argument("--disable-accelerated-jpeg-decoding")
-        chrome_options.add_argument("--disable-accelerated-mjpeg-decode")
-        chrome_options.add_argument("--disable-accelerated-video-decode")
-        chrome_options.add_argument("--disable-gpu-sandbox")
-        chrome_options.add_argument("--log-level=3")  # Suppress INFO, WARNING, ERROR logs
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        # Use local ChromeDriver instead of automated download
-        import os
-        
-        # Path to local ChromeDriver
-        chromedriver_path = os.path.join(os.path.dirname(__file__), "chromedriver-win64", "chromedriver.exe")
-        
-        if not os.path.exists(chromedriver_path):
-            raise Exception(f"ChromeDriver not found at: {chromedriver_path}")
-        
-        logging.info(f"Using local ChromeDriver at: {chromedriver_path}")
-        
-        try:
-            service = Service(chromedriver_path)
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.implicitly_wait(CRAWLER_CONFIG['implicit_wait'])
-            
-            # Test that driver works by accessing a simple page
-            self.driver.get("https://www.google.com")
-            # If we get here without exception, the driver is working
-            logging.info("WebDriver setup successful!")
-                
-        except Exception as e:
-            logging.error(f"WebDriver setup failed: {e}")
-            if hasattr(self, 'driver'):
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-            raise
-        
     def send_email_notification(self, is_success=True, message="", error_details=""):
         """Send email notification for crawler completion or failure"""
         if not EMAIL_CONFIG['enabled'] or not EMAIL_CONFIG['sender_password']:
@@ -146,215 +98,147 @@ Please check the crawler.log file for more detailed information.
             logging.error(f"Failed to send email notification: {e}")
             return False
         
-    def get_games_from_page(self, region):
-        """Extract all games from all pages for a given region"""
-        all_games = []
-        page_num = 1
-        games_per_page = 24  # Standard PlayStation store page size
+    def plan_regions(self):
+        """
+        Build the crawl plan {region: [alias regions]}.
+        Storefronts serving an identical pre-order catalog are crawled once and the
+        result is stored for every alias. Falls back to one locale per country.
+        """
+        registry = RegionRegistry()
+        # Refresh the region registry only if the cached copy is stale
+        valid_codes = registry.get_valid_codes()
         
-        while True:
-            try:
-                # Construct URL for pre-order category with page number
-                url = f"https://store.playstation.com/{region}/category/3bf499d7-7acf-4931-97dd-2667494ee2c9/{page_num}"
-                logging.info(f"Crawling {region} - Page {page_num}: {url}")
-                
-                # Navigate to page
-                self.driver.get(url)
-                time.sleep(CRAWLER_CONFIG['request_delay'])
-                
-                # Wait for game content to load - look for the product tiles
-                try:
-                    WebDriverWait(self.driver, CRAWLER_CONFIG['timeout']).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "[data-qa*='productTile']"))
-                    )
-                except TimeoutException:
-                    logging.warning(f"Timeout waiting for content on {url}")
-                    # If no content on first page, this region might not have pre-orders
-                    if page_num == 1:
-                        logging.info(f"No pre-order content found for {region}")
-                        return []
-                    break
-                
-                # Get page source and parse with BeautifulSoup
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Find game elements using the actual structure from the HTML analysis
-                # Look for divs with data-qa containing "productTile" and data-qa-index
-                game_elements = soup.find_all('div', {'data-qa': re.compile(r'.*productTile\d+.*'), 'data-qa-index': True})
-                
-                if not game_elements:
-                    logging.info(f"No games found on page {page_num} for {region}")
-                    # If no games on first page, region might not have pre-orders
-                    if page_num == 1:
-                        logging.info(f"No pre-order games available for {region}")
-                        return []
-                    break
-                
-                logging.info(f"Found {len(game_elements)} games on page {page_num} for {region}")
-                
-                # Extract game information
-                for game_element in game_elements:
-                    try:
-                        # Get the index from data-qa-index attribute (this is the position on the current page)
-                        page_index = int(game_element.get('data-qa-index', 0))
-                        
-                        # Calculate absolute rank across all pages
-                        display_rank = (page_num - 1) * games_per_page + page_index + 1
-                        
-                        # Extract product ID from data-telemetry-meta attribute instead of game name
-                        game_name = ""
-                        
-                        try:
-                            # Find the <a> tag within this game tile
-                            link_element = game_element.find('a')
-                            if link_element:
-                                # Get the data-telemetry-meta attribute
-                                telemetry_meta = link_element.get('data-telemetry-meta')
-                                if telemetry_meta:
-                                    # Parse the JSON string
-                                    telemetry_data = json.loads(telemetry_meta)
-                                    # Extract the "id" value
-                                    game_name = telemetry_data.get('id', '')
-                                    
-                                    if game_name:
-                                        logging.debug(f"Successfully extracted product ID: {game_name}")
-                                    else:
-                                        logging.warning(f"No 'id' found in telemetry data for element {page_index} on page {page_num}")
-                                else:
-                                    logging.warning(f"No data-telemetry-meta attribute found for element {page_index} on page {page_num}")
-                            else:
-                                logging.warning(f"No <a> tag found for element {page_index} on page {page_num}")
-                                
-                        except json.JSONDecodeError as e:
-                            logging.warning(f"Failed to parse JSON from data-telemetry-meta for element {page_index} on page {page_num}: {e}")
-                            game_name = ""
-                        except AttributeError as e:
-                            logging.warning(f"Attribute error extracting product ID for element {page_index} on page {page_num}: {e}")
-                            game_name = ""
-                        except Exception as e:
-                            logging.warning(f"Unexpected error extracting product ID for element {page_index} on page {page_num}: {e}")
-                            game_name = ""
-                        
-                        game_data = {
-                            'region': region,
-                            'game_name': game_name,
-                            'display_rank': display_rank
-                        }
-                        
-                        all_games.append(game_data)
-                        logging.debug(f"Extracted: {game_name} (Rank: {display_rank})")
-                        
-                    except Exception as e:
-                        logging.error(f"Error extracting game from {region} page {page_num}: {e}")
-                        continue
-                
-                # Check for next page by looking at pagination or by checking if we got a full page
-                # If we got fewer games than expected on this page, we're probably at the end
-                if len(game_elements) < games_per_page:
-                    logging.info(f"Reached last page for {region} at page {page_num} (only {len(game_elements)} games)")
-                    break
-                
-                # Also check for actual pagination elements
-                pagination_elements = soup.find_all(['button', 'a'], string=re.compile(r'\d+'))
-                if pagination_elements:
-                    # Look for a number higher than current page
-                    max_page_found = page_num
-                    for elem in pagination_elements:
-                        try:
-                            page_number = int(elem.get_text().strip())
-                            if page_number > max_page_found:
-                                max_page_found = page_number
-                        except (ValueError, AttributeError):
-                            continue
-                    
-                    if page_num >= max_page_found:
-                        logging.info(f"Reached max pagination for {region} at page {page_num}")
-                        break
-                
-                page_num += 1
-                
-                # Safety check - limit pages to prevent infinite loops
-                if page_num > 50:  # Reasonable limit
-                    logging.warning(f"Reached page limit for {region}")
-                    break
-                    
-            except Exception as e:
-                logging.error(f"Error crawling {region} page {page_num}: {e}")
-                break
+        if not REGION_CONFIG['catalog_dedup']:
+            return {code: [] for code in dedupe_codes(valid_codes)}
         
-        logging.info(f"Total games found for {region}: {len(all_games)}")
-        return all_games
-    
-    def crawl_region_with_retries(self, region, max_retries=None):
-        """Crawl a region with retry logic"""
-        if max_retries is None:
-            max_retries = CRAWLER_CONFIG['max_retries']
-            
-        for attempt in range(max_retries):
-            try:
-                games = self.get_games_from_page(region)
-                if games:
-                    return games
-                else:
-                    logging.warning(f"No games found for {region} on attempt {attempt + 1}")
-            except Exception as e:
-                logging.error(f"Attempt {attempt + 1} failed for {region}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(5)  # Wait before retry
+        groups = registry.get_catalog_groups()
+        if groups is not None:
+            # Locales that validated since the last fingerprint pass are crawled one per country
+            return complete_crawl_plan(groups, valid_codes)
+        
+        logging.info(f"Catalog fingerprints are stale - fingerprinting {len(valid_codes)} locales")
+        fingerprints = {}
+        for code in valid_codes:
+            fingerprints[code] = self.get_catalog_fingerprint(code)
         
-        logging.error(f"Failed to crawl {region} after {max_retries} attempts")
-        return []
+        groups = build_crawl_plan(valid_codes, fingerprints)
+        if any(fingerprints.values()):
+            registry.save_catalog_groups(groups)
+        return groups
     
-    def run_crawler(self):
-        """Main crawler execution"""
+    def run_crawler(self, resume=False):
+        """
+        Main crawler execution.
+        With resume=True, regions already stored today are skipped and partly crawled
+        regions continue from their checkpointed pages.
+        """
         logging.info("Starting PlayStation Store Crawler")
         start_time = datetime.now()
         
-        # Test database connection
-        if not self.db_manager.test_connection():
-            error_msg = "Database connection failed. Exiting."
-            logging.error(error_msg)
-            self.send_email_notification(False, "Database connection failed", error_msg)
-            return
+        # Test database connection - without MySQL the run still crawls and spools its results
+        result_spool = ResultSpool()
+        db_offline = not self.db_manager.test_connection()
+        if db_offline:
+            logging.warning(f"Database connection failed - crawling anyway and spooling results to "
+                            f"{result_spool.spool_file} (load them later with: python main_crawler.py flush-spool)")
+        else:
+            try:
+                # Load what earlier runs spooled before this run writes newer snapshots of the same regions
+                if result_spool.pending():
+                    result_spool.flush(self.db_manager)
+            except Exception as e:
+                logging.error(f"Error flushing the result spool: {e}")
         
-        # Connect to database
-        if not self.db_manager.connect():
-            error_msg = "Failed to connect to database. Exiting."
-            logging.error(error_msg)
-            self.send_email_notification(False, "Database connection failed", error_msg)
-            return
+        crawl_plan = self.plan_regions()
+        unique_codes = list(crawl_plan)
+        
+        self.checkpoint = RunCheckpoint()
+        resumed_regions = 0
+        if resume:
+            finished = self.checkpoint.finished_regions()
+            resumed_regions = sum(1 for region in unique_codes if region in finished)
+            unique_codes = [region for region in unique_codes if region not in finished]
+            logging.info(f"Resuming today's run: {resumed_regions} region(s) already finished, {len(unique_codes)} to crawl")
+        else:
+            self.checkpoint.reset()
+        
+        # Storefronts recently confirmed to have no pre-orders are not crawled again until the TTL expires
+        cached_empty = empty_region_cache.cached()
+        skipped_empty = [region for region in unique_codes if region in cached_empty]
+        if skipped_empty:
+            unique_codes = [region for region in unique_codes if region not in cached_empty]
+            logging.info(f"Skipping {len(skipped_empty)} region(s) confirmed empty in an earlier run: {skipped_empty}")
         
         total_games = 0
         successful_regions = 0
+        aliased_regions = 0
         failed_regions = []
+        spooled_regions = []
+        empty_regions = []
+        non_empty_regions = []
         
-        try:
-            for region in unique_codes:
-                logging.info(f"Starting crawl for region: {region}")
-                
-                try:
-                    games = self.crawl_region_with_retries(region)
-                    
-                    if games:
-                        # Insert games into database as JSON for this region
-                        if self.db_manager.insert_games_for_region(region, games):
-                            total_games += len(games)
-                            successful_regions += 1
-                            logging.info(f"Successfully processed {len(games)} games for {region}")
-                        else:
-                            logging.error(f"Failed to insert games for {region}")
-                            failed_regions.append(region)
-                    else:
-                        logging.warning(f"No games found for {region}")
-                        failed_regions.append(region)
-                        
-                except Exception as e:
-                    error_msg = f"Unexpected error processing {region}: {e}"
-                    logging.error(error_msg)
+        def region_stored(snapshot):
+            """Write-behind callback - the region's batch (with its aliases) is committed"""
+            nonlocal total_games, successful_regions, aliased_regions
+            total_games += len(snapshot.games)
+            successful_regions += 1
+            aliased_regions += len(snapshot.aliases)
+            logging.info(f"Successfully processed {len(snapshot.games)} games for {snapshot.region}")
+            self.checkpoint.mark_region(snapshot.region, 'stored', len(snapshot.games))
+        
+        def region_spooled(snapshot):
+            """Write-behind callback - MySQL was unreachable, the region waits in the local spool"""
+            nonlocal total_games
+            total_games += len(snapshot.games)
+            spooled_regions.append(snapshot.region)
+            self.checkpoint.mark_region(snapshot.region, 'spooled', len(snapshot.games))
+        
+        def region_write_failed(snapshot):
+            """Write-behind callback - the region could not be written after every retry"""
+            logging.error(f"Failed to insert games for {snapshot.region}")
+            failed_regions.append(snapshot.region)
+            self.checkpoint.mark_region(snapshot.region, 'failed')
+        
+        # Snapshots are written in batches by a background thread (see write_behind.py)
+        write_buffer = WriteBehindBuffer(self.db_manager, on_stored=region_stored, on_failed=region_write_failed,
+                                         spool=result_spool, on_spooled=region_spooled, offline=db_offline).start()
+        
+        def write_region(region, games, crawl_error):
+            """Writer stage - hand one crawled region (and its aliases) to the write-behind buffer"""
+            try:
+                if crawl_error:
+                    # Includes regions with a missing page - a truncated ranking is never stored
+                    logging.error(f"Failed to crawl {region}: {crawl_error}")
                     failed_regions.append(region)
-                
-                # Delay between regions
-                time.sleep(CRAWLER_CONFIG['request_delay'])
+                    self.checkpoint.mark_region(region, 'failed')
+                elif games:
+                    non_empty_regions.append(region)
+                    # Storefronts with the same catalog reuse this region's result; the region is
+                    # checkpointed as stored once its batch commits (its pages are kept until then)
+                    write_buffer.add(region, games, crawl_plan[region])
+                elif empty_region_cache.is_confirmed(region):
+                    logging.info(f"No pre-orders in {region} - the store shows no results")
+                    empty_regions.append(region)
+                    self.checkpoint.mark_region(region, 'empty')
+                else:
+                    logging.warning(f"No games found for {region}")
+                    failed_regions.append(region)
+                    self.checkpoint.mark_region(region, 'failed')
+                        
+            except Exception as e:
+                error_msg = f"Unexpected error processing {region}: {e}"
+                logging.error(error_msg)
+                failed_regions.append(region)
+        
+        try:
+            # Regions are crawled in parallel by browser workers or by tabs of this browser and
+            # handed to the writer stage (this thread) through a bounded queue, which buffers them
+            # for the batched database writes, so crawling continues while snapshots are committed
+            if CRAWLER_CONFIG['concurrency_mode'] == 'tabs':
+                pool = MultiTabCrawler(self)
+            else:
+                pool = BrowserWorkerPool(primary=self, crawler_factory=lambda: RegionCrawler(self.checkpoint))
+            CrawlPipeline().run(pool.crawl(unique_codes), write_region)
                 
         except KeyboardInterrupt:
             error_msg = "Crawler interrupted by user"
@@ -365,10 +249,23 @@ Please check the crawler.log file for more detailed information.
             logging.error(error_msg)
             self.send_email_notification(False, "Unexpected crawler error", error_msg)
         finally:
-            # Cleanup
+            # Cleanup - flush the buffered snapshots before the connection and checkpoint close
+            write_buffer.close()
+            spooled_left = 0
+            try:
+                if not write_buffer.offline and result_spool.pending():
+                    # MySQL is up (again) - load what was spooled; rows superseded by this run's
+                    # snapshots were already dropped by the write-behind buffer
+                    result_spool.flush(self.db_manager)
+                spooled_left = result_spool.pending()
+            except Exception as e:
+                logging.error(f"Error flushing the result spool: {e}")
+            result_spool.close()
             self.db_manager.disconnect()
-            if hasattr(self, 'driver'):
-                self.driver.quit()
+            self.checkpoint.close()
+            empty_region_cache.save(non_empty_regions)
+            self.close()
+            parse_pool.shutdown()
             
             # Calculate execution time
             end_time = datetime.now()
@@ -378,10 +275,38 @@ Please check the crawler.log file for more detailed information.
             logging.info(f"Crawler completed:")
             logging.info(f"  Total games crawled: {total_games}")
             logging.info(f"  Successful regions: {successful_regions}/{len(unique_codes)}")
+            logging.info(f"  Aliased regions stored: {aliased_regions}")
+            if resume:
+                logging.info(f"  Regions already stored before resuming: {resumed_regions}")
+            logging.info(f"  Empty regions (no pre-orders): {len(empty_regions)} crawled, {len(skipped_empty)} skipped via cache")
             logging.info(f"  Failed regions: {len(failed_regions)}")
+            if spooled_regions or spooled_left:
+                logging.info(f"  Spooled while MySQL was unreachable: {len(spooled_regions)} region(s) this run, "
+                             f"{spooled_left} row(s) still waiting for flush-spool")
             logging.info(f"  Execution time: {execution_time}")
+            logging.info(f"  Request rate: ended at {self.rate_limiter.rate:.2f}/s "
+                         f"({self.rate_limiter.throttle_events} throttling signals)")
+            readiness = readiness_recorder.summary()
+            if readiness:
+                logging.info(f"  Page readiness: p50 {readiness['p50']:.2f}s, p95 {readiness['p95']:.2f}s, "
+                             f"max {readiness['max']:.2f}s over {readiness['pages']} pages ({readiness['timeouts']} timeouts)")
+            stages = stage_metrics.summary()
+            if stages:
+                logging.info("  Time per stage: " + ", ".join(
+                    f"{stage} {timing['sum']:.0f}s (p95 {timing['p95']:.2f}s)" for stage, timing in stages.items()))
+            metrics_file = stage_metrics.export()
+            if metrics_file:
+                logging.info(f"  Stage timings written to {metrics_file}")
+            if region_profiler.enabled:
+                profile_summary, cpu_by_category = region_profiler.dump()
+                if profile_summary:
+                    logging.info("  Profiled time by category: " + ", ".join(
+                        f"{category} {seconds:.1f}s" for category, seconds in cpu_by_category.items()))
+                    logging.info(f"  Hot-function summary written to {profile_summary}")
             
             # Send success/failure notification
+            spool_note = (f" {spooled_left} row(s) are spooled locally until MySQL is back "
+                          f"(python main_crawler.py flush-spool)." if spooled_left else "")
             if failed_regions and len(failed_regions) == len(unique_codes):
                 # Complete failure
                 self.send_email_notification(False, 
@@ -389,20 +314,54 @@ Please check the crawler.log file for more detailed information.
                     f"Failed regions: {failed_regions}")
             elif failed_regions:
                 # Partial failure
-                success_msg = f"Crawled {total_games} games from {successful_regions} regions. Some regions failed: {failed_regions}"
+                success_msg = f"Crawled {total_games} games from {successful_regions} regions. Some regions failed: {failed_regions}.{spool_note}"
                 self.send_email_notification(True, success_msg)
             else:
                 # Complete success
-                success_msg = f"Successfully crawled {total_games} games from {successful_regions} regions in {execution_time}"
+                success_msg = f"Successfully crawled {total_games} games from {successful_regions} regions in {execution_time}.{spool_note}"
                 self.send_email_notification(True, success_msg)
             
             if failed_regions:
                 logging.info(f"  Failed regions list: {failed_regions}")
 
+def flush_spool():
+    """Load results spooled while MySQL was unreachable into preorder_games"""
+    logging.basicConfig(level=getattr(logging, LOG_CONFIG['level']), format=LOG_CONFIG['format'],
+                        handlers=[logging.FileHandler(LOG_CONFIG['filename']), logging.StreamHandler()])
+    db_manager = DatabaseManager()
+    result_spool = ResultSpool()
+    try:
+        if not result_spool.pending():
+            logging.info(f"Nothing to flush - {result_spool.spool_file} is empty")
+            return True
+        if not db_manager.test_connection():
+            logging.error("Database connection failed - the spool is kept for the next flush-spool")
+            return False
+        _, remaining = result_spool.flush(db_manager)
+        return remaining == 0
+    finally:
+        result_spool.close()
+        db_manager.disconnect()
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="PlayStation Store pre-order crawler")
+    parser.add_argument('command', nargs='?', choices=['crawl', 'flush-spool'], default='crawl',
+                        help="crawl the store (default), or load results spooled while MySQL was down")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue today's interrupted run instead of starting over")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each region's crawl and database insert with cProfile")
+    args = parser.parse_args()
+    
+    if args.command == 'flush-spool':
+        sys.exit(0 if flush_spool() else 1)
+    if args.profile:
+        region_profiler.enable()
+        # Parse in the crawler threads, so parsing shows up in the region profiles
+        parse_pool.workers = 0
     crawler = PlayStationCrawler()
-    crawler.run_crawler()
+    crawler.run_crawler(resume=args.resume)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
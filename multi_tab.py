@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Multi-tab crawling - keeps several navigations in flight inside one Chrome instance
+Each tab walks the pages of one region; the driver only switches to a tab to start
+a navigation or to harvest a page whose tiles have rendered.
+"""
+
+import time
+import logging
+from collections import deque
+from config import CRAWLER_CONFIG, NETWORK_BLOCKING_CONFIG
+from page_parser import build_page_url, make_page
+from page_readiness import TilesReady, NAVIGATE_SCRIPT, readiness_recorder
+from network_blocking import enable_resource_blocking, measure_page_weight
+from region_crawler import (IncompleteRegionError, DriverStartupError, backoff_delay, expected_last_page,
+                            is_page_promised, is_short_page)
+from region_registry import empty_region_cache
+from driver_health import is_driver_alive
+from stage_metrics import stage_metrics
+from region_profiler import region_profiler
+from selenium.common.exceptions import WebDriverException
+
+class TabState:
+    """Progress of the region currently assigned to one tab"""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.region = None
+        self.attempt = 0
+        self.page_num = 0
+        self.last_page = 1
+        self.previous_page = None
+        self.games = []
+        self.prefetched = {}
+        self.retry_at = None
+        self.region_started = None
+        self.started = None
+        self.deadline = None
+        self.readiness = None
+
+    @property
+    def idle(self):
+        return self.region is None
+
+    def incomplete_error(self):
+        """IncompleteRegionError if the page that failed was promised, otherwise None"""
+        if not is_page_promised(self.page_num, self.last_page, self.previous_page):
+            return None
+        return IncompleteRegionError(self.region, self.page_num, max(self.last_page, self.page_num), self.games)
+
+class MultiTabCrawler:
+    def __init__(self, crawler, num_tabs=None):
+        """
+        crawler: a RegionCrawler whose driver, HTTP fast path and page logic are reused
+        num_tabs: tabs kept open at once (defaults to CRAWLER_CONFIG['tabs_per_browser'])
+        """
+        self.crawler = crawler
+        self.num_tabs = max(1, num_tabs or CRAWLER_CONFIG['tabs_per_browser'])
+
+    @property
+    def driver(self):
+        # The crawler may replace its driver mid-run
+        return self.crawler.driver
+
+    def _open_tabs(self, count):
+        """Open tabs next to the current one and return their window handles"""
+        handles = [self.driver.current_window_handle]
+        for _ in range(count - 1):
+            self.driver.switch_to.new_window('tab')
+            # CDP blocking is per tab
+            enable_resource_blocking(self.driver)
+            handles.append(self.driver.current_window_handle)
+        return handles
+
+    def _close_tabs(self, handles):
+        """Close every tab but the first and switch back to it"""
+        for handle in handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                logging.warning(f"Error closing tab: {e}")
+        try:
+            self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            logging.warning(f"Error switching back to the first tab: {e}")
+
+    def _restart_browser(self, tabs, reason, failed_tab=None):
+        """
+        Recreate the driver and its tabs. Pages that were loading are started again on the
+        new tabs; the pages each region has already collected are kept.
+        Returns the new window handles.
+        """
+        self.crawler.restart_driver(reason)
+        self.driver.implicitly_wait(0)
+        handles = self._open_tabs(len(tabs))
+        now = time.monotonic()
+        for tab, handle in zip(tabs, handles):
+            tab.handle = handle
+            if tab.idle or tab.retry_at is not None or tab is failed_tab:
+                continue
+            # Navigation was in flight in the old browser - start the same page again
+            tab.page_num -= 1
+            tab.retry_at = now
+        return handles
+
+    def _start_page(self, tab):
+        """Load the tab's next page - from the HTTP fast path if possible, otherwise by navigating the tab"""
+        tab.page_num += 1
+
+        page = tab.prefetched.pop(tab.page_num, None)
+        if page is not None:
+            return page
+
+        if self.crawler.http_fetcher:
+            page = self.crawler.http_fetcher.fetch_page(tab.region, tab.page_num)
+            if page and (page['tile_count'] or page['empty']):
+                return page
+            logging.info(f"HTTP fast path found no tiles for {tab.region} page {tab.page_num} - loading in tab")
+
+        # Navigations share the same politeness budget as every other worker
+        stage_metrics.observe('rate_limit_wait', self.crawler.rate_limiter.acquire(), tab.region)
+
+        url = build_page_url(tab.region, tab.page_num)
+        logging.info(f"Crawling {tab.region} - Page {tab.page_num} in tab: {url}")
+        with stage_metrics.time('navigate', tab.region):
+            self.driver.switch_to.window(tab.handle)
+            # Assigning location returns immediately, unlike driver.get(); the old document is
+            # flagged first, as its tiles stay in the DOM until the new one commits
+            self.driver.execute_script(NAVIGATE_SCRIPT, url)
+        tab.started = time.monotonic()
+        tab.deadline = tab.started + CRAWLER_CONFIG['timeout']
+        tab.readiness = TilesReady(url=url, page_num=tab.page_num)
+        return None
+
+    def _harvest(self, tab):
+        """
+        Check a loading tab. Returns (done, page): done is False while the page is still loading;
+        page is the parsed page (marked empty on a "no results" page), or None if the tiles
+        never appeared before the timeout.
+        """
+        self.driver.switch_to.window(tab.handle)
+        tile_count = tab.readiness(self.driver)
+        if not tile_count:
+            if time.monotonic() <= tab.deadline:
+                return False, None
+            # Out of time - a grid that never settled is not taken as a short page, the page is retried
+            partial = tab.readiness.tile_count(self.driver)
+            if partial:
+                logging.warning(f"Tile grid still incomplete on {tab.region} page {tab.page_num} ({partial} tiles) - not ready")
+            tile_count = 0
+        if tab.readiness.empty:
+            tile_count = 0
+        self.crawler.supervisor.page_loaded()
+
+        latency = time.monotonic() - tab.started
+        stage_metrics.observe('readiness', latency, tab.region)
+        page_weight = measure_page_weight(self.driver) if NETWORK_BLOCKING_CONFIG['record_page_weight'] else None
+        readiness_recorder.record(tab.region, tab.page_num, latency, tile_count, 'selenium-tab', page_weight,
+                                  tab.readiness.empty)
+        if tab.readiness.empty:
+            return True, make_page([], 0, None, 'selenium-tab', empty=True)
+        if not tile_count:
+            logging.warning(f"Timeout waiting for content on {tab.region} page {tab.page_num}")
+            self.crawler.rate_limiter.report_throttle("no tiles before timeout")
+            return True, None
+        self.crawler.rate_limiter.report_success(latency)
+        return True, self.crawler.extract_loaded_page(tab.region, tab.page_num, 'selenium-tab')
+
+    def _schedule_retry(self, tab, reason):
+        """
+        Retry the tab's current page after a backoff, keeping the pages already collected.
+        Returns False once the page has used all its attempts.
+        """
+        max_attempts = CRAWLER_CONFIG['max_retries']
+        logging.warning(f"{reason} on {tab.region} page {tab.page_num} (attempt {tab.attempt}/{max_attempts})")
+        if tab.attempt >= max_attempts:
+            return False
+        delay = backoff_delay(tab.attempt)
+        tab.retry_at = time.monotonic() + delay
+        stage_metrics.count('page_retry')
+        stage_metrics.observe('retry_backoff', delay, tab.region)
+        tab.attempt += 1
+        # _start_page moves on to page_num + 1
+        tab.page_num -= 1
+        return True
+
+    def _advance(self, tab, page):
+        """
+        Feed a finished page into the region's results and start the next one.
+        Returns (region, games) when the region is finished, otherwise None.
+        Raises IncompleteRegionError if a page the pagination or a full previous page promised
+        could not be fetched, or a page before the announced last page stayed short.
+        """
+        while True:
+            short = is_short_page(tab.page_num, tab.last_page, page)
+            if short or page is None or not (page['tile_count'] or page['empty']):
+                reason = f"Only {page['tile_count']} tiles before the last page" if short else "No tiles"
+                if self._schedule_retry(tab, reason):
+                    return None
+                if short:
+                    raise IncompleteRegionError(tab.region, tab.page_num, expected_last_page(tab.last_page, page), tab.games)
+                incomplete = tab.incomplete_error()
+                if incomplete:
+                    raise incomplete
+            if not self.crawler.process_page(tab.region, tab.page_num, page, tab.games):
+                break
+            tab.attempt = 1
+            tab.last_page = expected_last_page(tab.last_page, page)
+            tab.previous_page = page
+            if not tab.prefetched:
+                tab.prefetched = self.crawler.prefetch_http_pages(
+                    tab.region, self.crawler.fanout_pages(tab.page_num, page))
+            page = self._start_page(tab)
+            if page is None:
+                # Navigation in flight - harvest on a later pass
+                return None
+
+        region, games = tab.region, tab.games
+        tab.prefetched = {}
+        stage_metrics.observe('region', time.monotonic() - tab.region_started, region)
+        logging.info(f"Total games found for {region}: {len(games)}")
+        if not games and not empty_region_cache.is_confirmed(region):
+            logging.error(f"Failed to crawl {region} after {CRAWLER_CONFIG['max_retries']} attempts")
+        tab.region = None
+        return region, games
+
+    def _assign(self, tab, region):
+        """Give an idle tab a region and start its first page"""
+        tab.region = region
+        tab.region_started = time.monotonic()
+        tab.attempt = 1
+        tab.page_num = 0
+        tab.last_page = 1
+        tab.previous_page = None
+        tab.games = []
+        tab.prefetched = self.crawler.resume_pages(region)
+        tab.retry_at = None
+        page = self._start_page(tab)
+        if page is not None:
+            return self._advance(tab, page)
+        return None
+
+    def _step(self, tab, pending):
+        """Move one tab forward. Returns (region, games) when its region is finished, otherwise None."""
+        if tab.idle:
+            if not pending:
+                return None
+            return self._assign(tab, pending.popleft())
+
+        if tab.retry_at is not None:
+            if time.monotonic() < tab.retry_at:
+                return None
+            tab.retry_at = None
+            page = self._start_page(tab)
+            if page is None:
+                return None
+            return self._advance(tab, page)
+
+        done, page = self._harvest(tab)
+        if not done:
+            return None
+        return self._advance(tab, page)
+
+    def crawl(self, regions):
+        """
+        Crawl the regions across the tabs of one browser.
+        Yields (region, games, error) in completion order, like BrowserWorkerPool.crawl.
+        """
+        pending = deque(regions)
+        handles = self._open_tabs(min(self.num_tabs, max(1, len(regions))))
+        tabs = [TabState(handle) for handle in handles]
+        logging.info(f"Crawling {len(regions)} regions with {len(tabs)} tab(s) in one browser")
+
+        # Tabs are polled, so lookups must not block on the implicit wait
+        self.driver.implicitly_wait(0)
+        try:
+            while pending or any(not tab.idle for tab in tabs):
+                reason = self.crawler.supervisor.restart_reason(self.driver)
+                if reason:
+                    handles = self._restart_browser(tabs, reason)
+
+                for tab in tabs:
+                    try:
+                        # An idle tab is about to start the next pending region
+                        profiled_region = tab.region or (pending[0] if pending else None)
+                        with region_profiler.profile(profiled_region, 'crawl'):
+                            finished = self._step(tab, pending)
+                    except DriverStartupError:
+                        # No browser to retry with - let the caller report the run
+                        raise
+                    except IncompleteRegionError as e:
+                        logging.error(str(e))
+                        stage_metrics.observe('region', time.monotonic() - tab.region_started, e.region)
+                        tab.region = None
+                        yield e.region, [], str(e)
+                        continue
+                    except Exception as e:
+                        if isinstance(e, WebDriverException) and not is_driver_alive(self.driver):
+                            # Chrome died or hung - every tab goes with it
+                            handles = self._restart_browser(tabs, "session stopped responding", failed_tab=tab)
+                        # A failing page is retried; only a page out of attempts loses the region
+                        if tab.region and self._schedule_retry(tab, f"Tab error ({e})"):
+                            continue
+                        region, error = tab.region, str(e)
+                        incomplete = tab.incomplete_error() if region else None
+                        if incomplete:
+                            error = str(incomplete)
+                        logging.error(f"Tab failed on {region}: {error}")
+                        if region:
+                            stage_metrics.observe('region', time.monotonic() - tab.region_started, region)
+                        tab.region = None
+                        yield region, [], error
+                        continue
+
+                    if finished:
+                        region, games = finished
+                        yield region, games, None
+
+                time.sleep(CRAWLER_CONFIG['tab_poll_interval'])
+        finally:
+            self._close_tabs(handles)
+            self.driver.implicitly_wait(CRAWLER_CONFIG['implicit_wait'])
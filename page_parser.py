@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Page parsing helpers shared by every fetch mode (Selenium, plain HTTP, embedded page state)
+"""
+
+import re
+import json
+import logging
+from config import CRAWLER_CONFIG
+
+GAMES_PER_PAGE = 24  # Standard PlayStation store page size
+MAX_PAGES = 50  # Safety limit on pages per region
+CATEGORY_ID = "3bf499d7-7acf-4931-97dd-2667494ee2c9"  # Pre-order category
+
+# Precompiled once - these run against every tile and pagination element
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+TILE_QA_PATTERN = re.compile(r'productTile\d+')
+PAGINATION_TEXT_PATTERN = re.compile(r'\d+')
+# The store's explicit "no results" placeholder, shown instead of the grid when a category is empty
+EMPTY_STATE_PATTERN = re.compile(r'data-qa="[^"]*no-results')
+# Bot-protection interstitials served instead of the store page
+CHALLENGE_PATTERN = re.compile(r'<title>\s*(Access Denied|Just a moment\.\.\.|Attention Required)|px-captcha|cf-chl-', re.IGNORECASE)
+
+TILE_ERRORS = {
+    'no_link': "No <a> tag found",
+    'no_meta': "No data-telemetry-meta attribute found",
+    'bad_json': "Failed to parse JSON from data-telemetry-meta"
+}
+
+def build_page_url(region, page_num):
+    """Construct URL for pre-order category with page number"""
+    return f"{CRAWLER_CONFIG['store_base_url']}/{region}/category/{CATEGORY_ID}/{page_num}"
+
+def is_challenge_page(html):
+    """True if the response is a bot-protection challenge rather than a category page"""
+    return bool(CHALLENGE_PATTERN.search(html[:20000]))
+
+def is_empty_state_page(html):
+    """True if the page shows the store's "no results" placeholder instead of a tile grid"""
+    return bool(EMPTY_STATE_PATTERN.search(html))
+
+def make_page(games, tile_count, max_page, source, empty=False):
+    """Bundle the result of one category page; empty marks a confirmed "no results" page"""
+    return {
+        'games': games,
+        'tile_count': tile_count,
+        'max_page': max_page,
+        'source': source,
+        'empty': empty
+    }
+
+def find_game_elements(soup):
+    """Find product tile elements in a parsed category page"""
+    # Find game elements using the actual structure from the HTML analysis
+    # Look for divs with data-qa containing "productTile" and data-qa-index
+    return soup.find_all('div', {'data-qa': TILE_QA_PATTERN, 'data-qa-index': True})
+
+def extract_games(game_elements, region, page_num):
+    """Extract game records from the product tiles of one page"""
+    games = []
+    
+    # Extract game information
+    for game_element in game_elements:
+        try:
+            # Get the index from data-qa-index attribute (this is the position on the current page)
+            page_index = int(game_element.get('data-qa-index', 0))
+            
+            # Calculate absolute rank across all pages
+            display_rank = (page_num - 1) * GAMES_PER_PAGE + page_index + 1
+            
+            # Extract product ID from data-telemetry-meta attribute instead of game name
+            game_name = ""
+            
+            try:
+                # Find the <a> tag within this game tile
+                link_element = game_element.find('a')
+                if link_element:
+                    # Get the data-telemetry-meta attribute
+                    telemetry_meta = link_element.get('data-telemetry-meta')
+                    if telemetry_meta:
+                        # Parse the JSON string
+                        telemetry_data = json.loads(telemetry_meta)
+                        # Extract the "id" value
+                        game_name = telemetry_data.get('id', '')
+                        
+                        if game_name:
+                            logging.debug(f"Successfully extracted product ID: {game_name}")
+                        else:
+                            logging.warning(f"No 'id' found in telemetry data for element {page_index} on page {page_num}")
+                    else:
+                        logging.warning(f"No data-telemetry-meta attribute found for element {page_index} on page {page_num}")
+                else:
+                    logging.warning(f"No <a> tag found for element {page_index} on page {page_num}")
+                    
+            except json.JSONDecodeError as e:
+                logging.warning(f"Failed to parse JSON from data-telemetry-meta for element {page_index} on page {page_num}: {e}")
+                game_name = ""
+            except AttributeError as e:
+                logging.warning(f"Attribute error extracting product ID for element {page_index} on page {page_num}: {e}")
+                game_name = ""
+            except Exception as e:
+                logging.warning(f"Unexpected error extracting product ID for element {page_index} on page {page_num}: {e}")
+                game_name = ""
+            
+            game_data = {
+                'region': region,
+                'game_name': game_name,
+                'display_rank': display_rank
+            }
+            
+            games.append(game_data)
+            logging.debug(f"Extracted: {game_name} (Rank: {display_rank})")
+            
+        except Exception as e:
+            logging.error(f"Error extracting game from {region} page {page_num}: {e}")
+            continue
+    
+    return games
+
+def find_max_page(soup, page_num):
+    """Highest page number shown in the pagination control, or None if there is no pagination"""
+    pagination_elements = soup.find_all(['button', 'a'], string=PAGINATION_TEXT_PATTERN)
+    if not pagination_elements:
+        return None
+    
+    # Look for a number higher than current page
+    max_page_found = page_num
+    for elem in pagination_elements:
+        try:
+            page_number = int(elem.get_text().strip())
+            if page_number > max_page_found:
+                max_page_found = page_number
+        except (ValueError, AttributeError):
+            continue
+    return max_page_found
+
+def tile_record(index_value, has_link, telemetry_meta):
+    """
+    Build a compact {index, telemetry_id, name, error} record for one tile.
+    Used by every backend that does not walk a BeautifulSoup tree (in-page JS, lxml, selectolax).
+    """
+    record = {'index': int(index_value), 'telemetry_id': None, 'name': None, 'error': None}
+    if not has_link:
+        record['error'] = 'no_link'
+    elif not telemetry_meta:
+        record['error'] = 'no_meta'
+    else:
+        try:
+            telemetry_data = json.loads(telemetry_meta)
+            record['telemetry_id'] = telemetry_data.get('id', '')
+            record['name'] = telemetry_data.get('name')
+        except (ValueError, AttributeError):
+            record['error'] = 'bad_json'
+    return record
+
+def games_from_tile_records(records, region, page_num):
+    """Turn tile records into game rows, ranked and logged like extract_games"""
+    games = []
+    for record in records:
+        page_index = record['index']
+        game_name = record['telemetry_id'] or ""
+        if record['error']:
+            logging.warning(f"{TILE_ERRORS[record['error']]} for element {page_index} on page {page_num}")
+        elif not game_name:
+            logging.warning(f"No 'id' found in telemetry data for element {page_index} on page {page_num}")
+        games.append({
+            'region': region,
+            'game_name': game_name,
+            'display_rank': (page_num - 1) * GAMES_PER_PAGE + page_index + 1
+        })
+    return games
+
+def max_page_from_numbers(numbers, page_num):
+    """Pagination result from the page numbers found on a page (None if there were none)"""
+    if not numbers:
+        return None
+    return max(page_num, max(numbers))
+
+def parse_soup(soup, region, page_num, source):
+    """Extract games and pagination from a parsed category page"""
+    game_elements = find_game_elements(soup)
+    games = extract_games(game_elements, region, page_num)
+    return make_page(games, len(game_elements), find_max_page(soup, page_num), source)
+
+def _find_category_grid(node):
+    """Recursively find the first object that carries both a product list and pageInfo"""
+    if isinstance(node, dict):
+        if isinstance(node.get('products'), list) and isinstance(node.get('pageInfo'), dict):
+            return node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        grid = _find_category_grid(child)
+        if grid is not None:
+            return grid
+    return None
+
+def _product_id(product):
+    """Product ID from an inline product or an Apollo reference like 'Product:<id>:<locale>'"""
+    if isinstance(product, dict):
+        if product.get('id'):
+            return product['id']
+        ref = product.get('__ref', '')
+        if ref.startswith('Product:'):
+            return ref[len('Product:'):].rsplit(':', 1)[0]
+    return ""
+
+def extract_games_from_state(html, region, page_num):
+    """
+    Extract games from the embedded Next.js page state (__NEXT_DATA__) of a category page.
+    Returns None if the page carries no recognisable category grid.
+    """
+    match = NEXT_DATA_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        state = json.loads(match.group(1))
+    except json.JSONDecodeError as e:
+        logging.warning(f"Failed to parse embedded page state for {region} page {page_num}: {e}")
+        return None
+    
+    grid = _find_category_grid(state)
+    if grid is None:
+        return None
+    
+    games = []
+    for page_index, product in enumerate(grid['products']):
+        games.append({
+            'region': region,
+            'game_name': _product_id(product),
+            'display_rank': (page_num - 1) * GAMES_PER_PAGE + page_index + 1
+        })
+    
+    max_page = None
+    page_info = grid['pageInfo']
+    total_count = page_info.get('totalCount')
+    size = page_info.get('size') or GAMES_PER_PAGE
+    if total_count is not None:
+        max_page = max(page_num, -(-int(total_count) // int(size)))
+    
+    return make_page(games, len(games), max_page, 'state', empty=not games and total_count == 0)
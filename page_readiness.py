@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Page readiness engine - decides when a category page has finished rendering its tiles
+and records how long that took, so timeouts can be tuned from data
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from config import CRAWLER_CONFIG
+from page_parser import GAMES_PER_PAGE
+
+# Top-level product tiles only - nested elements also carry 'productTile' in data-qa
+TILE_SELECTOR = "[data-qa*='productTile'][data-qa-index]"
+PAGINATION_SELECTOR = "[data-qa*='paginator']"
+EMPTY_STATE_SELECTOR = "[data-qa*='no-results']"
+PAGE_NUMBER_PATTERN = re.compile(r'\d+')
+
+# The previous document keeps its tiles until the next one commits, so navigations flag it first
+MARK_STALE_SCRIPT = "window.__stale = true;"
+NAVIGATE_SCRIPT = "window.__stale = true; window.location.href = arguments[0];"
+CURRENT_URL_SCRIPT = "return window.__stale === true ? null : window.location.href;"
+
+def mark_stale(driver):
+    """Flag the current document, so readiness ignores it until the next navigation has committed"""
+    driver.execute_script(MARK_STALE_SCRIPT)
+
+def same_page(href, url):
+    """Whether the loaded location is the requested page (query string, fragment and trailing slash ignored)"""
+    def normalize(address):
+        return address.split('#')[0].split('?')[0].rstrip('/').lower()
+    return normalize(href) == normalize(url)
+
+class TilesReady:
+    """
+    WebDriverWait condition that is satisfied when the tile grid is complete:
+    a full page of tiles, a partial grid on the paginator's last page (with
+    page_num given), or a tile count that has not changed for readiness_stable_for
+    seconds. A paginator next to a partial grid on an earlier page is not enough -
+    the rest of the grid may still be rendering.
+    Returns the tile count once ready. A page showing the store's "no results"
+    placeholder is ready straight away, with empty set to True.
+    With url given, nothing counts until the document flagged by mark_stale is gone
+    and the requested page is loaded, so the previous page's tiles are never read.
+    """
+
+    def __init__(self, stable_for=None, url=None, page_num=None):
+        self.stable_for = stable_for if stable_for is not None else CRAWLER_CONFIG['readiness_stable_for']
+        self.url = url
+        self.page_num = page_num
+        self.last_count = 0
+        self.stable_since = None
+        self.empty = False
+
+    def on_target(self, driver):
+        """True once the requested page's document is the one loaded"""
+        if self.url is None:
+            return True
+        href = driver.execute_script(CURRENT_URL_SCRIPT)
+        return href is not None and same_page(href, self.url)
+
+    def on_last_page(self, driver):
+        """True if the rendered paginator shows no page beyond page_num"""
+        if self.page_num is None:
+            return False
+        numbers = [int(number) for paginator in driver.find_elements(By.CSS_SELECTOR, PAGINATION_SELECTOR)
+                   for number in PAGE_NUMBER_PATTERN.findall(paginator.text)]
+        return bool(numbers) and self.page_num >= max(numbers)
+
+    def tile_count(self, driver):
+        if not self.on_target(driver):
+            return 0
+        return len(driver.find_elements(By.CSS_SELECTOR, TILE_SELECTOR))
+
+    def __call__(self, driver):
+        if not self.on_target(driver):
+            # Still the previous document (or a redirect) - neither its tiles nor its placeholder count
+            self.last_count = 0
+            self.stable_since = None
+            return False
+        count = len(driver.find_elements(By.CSS_SELECTOR, TILE_SELECTOR))
+        if count == 0:
+            self.last_count = 0
+            self.stable_since = None
+            if driver.find_elements(By.CSS_SELECTOR, EMPTY_STATE_SELECTOR):
+                self.empty = True
+                return True
+            return False
+
+        if count >= GAMES_PER_PAGE:
+            return count
+        if self.on_last_page(driver):
+            return count
+
+        now = time.monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.stable_since = now
+            return False
+        if now - self.stable_since >= self.stable_for:
+            return count
+        return False
+
+class zero_implicit_wait:
+    """Context manager that disables the driver's implicit wait so empty lookups return immediately"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        self.driver.implicitly_wait(0)
+        return self.driver
+
+    def __exit__(self, exc_type, exc, tb):
+        self.driver.implicitly_wait(CRAWLER_CONFIG['implicit_wait'])
+        return False
+
+def wait_for_page_ready(driver, timeout=None, url=None, page_num=None):
+    """
+    Wait until the current page's tile grid is ready (with url / page_num, the grid of that page - see TilesReady).
+    Returns (tile_count, latency_seconds, empty). tile_count is 0 if the grid was not ready before the
+    timeout - also when some tiles rendered but never settled, so the page is retried instead of being
+    taken as a short last page.
+    empty is True if the store showed its "no results" placeholder, which returns without waiting.
+    """
+    if timeout is None:
+        timeout = CRAWLER_CONFIG['timeout']
+
+    condition = TilesReady(url=url, page_num=page_num)
+    start = time.monotonic()
+    with zero_implicit_wait(driver):
+        try:
+            tile_count = WebDriverWait(driver, timeout, poll_frequency=CRAWLER_CONFIG['readiness_poll_interval']).until(condition)
+        except TimeoutException:
+            partial = condition.tile_count(driver)
+            if partial:
+                logging.warning(f"Tile grid still incomplete after {timeout}s ({partial} tiles) - not ready")
+            tile_count = 0
+    if condition.empty:
+        tile_count = 0
+    return tile_count, time.monotonic() - start, condition.empty
+
+class ReadinessRecorder:
+    """Thread-safe log of per-page readiness latency, appended to a JSON Lines file"""
+
+    def __init__(self, log_file=None):
+        log_file = log_file or CRAWLER_CONFIG['readiness_log_file']
+        if not os.path.isabs(log_file):
+            log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), log_file)
+        self.log_file = log_file
+        self.latencies = []
+        self.timeouts = 0
+        self.lock = threading.Lock()
+
+    def record(self, region, page_num, latency, tile_count, source, page_weight=None, empty=False):
+        """Record how long one page took to become ready, plus its transfer size if measured"""
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'region': region,
+            'page': page_num,
+            'latency': round(latency, 3),
+            'tiles': tile_count,
+            'source': source
+        }
+        if empty:
+            entry['empty'] = True
+        if page_weight:
+            entry.update(page_weight)
+        logging.debug(f"Page ready in {latency:.2f}s with {tile_count} tiles: {region} page {page_num}")
+        with self.lock:
+            self.latencies.append(latency)
+            if not tile_count and not empty:
+                self.timeouts += 1
+            try:
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except OSError as e:
+                logging.warning(f"Could not write readiness log {self.log_file}: {e}")
+
+    def summary(self):
+        """p50 / p95 / max readiness latency for this run"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            timeouts = self.timeouts
+        if not latencies:
+            return None
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))]
+        return {
+            'pages': len(latencies),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'max': latencies[-1],
+            'timeouts': timeouts
+        }
+
+readiness_recorder = ReadinessRecorder()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Process pool for HTML parsing - raw page HTML is handed to worker processes as UTF-8 bytes
+and compact tuples come back, so parsing (tree building, tile regexes, telemetry JSON) no
+longer runs under the GIL of the threads driving Chrome and several browser workers are
+not serialized on it. With parse_workers = 0 pages are parsed in the calling thread.
+"""
+
+import os
+import logging
+import logging.handlers
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import CRAWLER_CONFIG
+from page_parser import make_page
+from parser_backends import parse_html, parse_tiles
+
+PARSERS = {'html': parse_html, 'tiles': parse_tiles}
+MAX_AUTO_WORKERS = 4
+
+def default_workers():
+    """One parser process per core beyond the first (left to Chrome and the crawler threads), at most MAX_AUTO_WORKERS"""
+    return min(MAX_AUTO_WORKERS, (os.cpu_count() or 1) - 1)
+
+class _ForwardHandler(logging.Handler):
+    """Re-emits records from the worker processes through this process's loggers (crawler.log)"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+def _init_worker(log_queue, log_level, parser_backend):
+    """Worker process setup - log through the parent and use the parent's parser backend"""
+    CRAWLER_CONFIG['parser_backend'] = parser_backend
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(log_level)
+
+def _parse_in_worker(parser, html_bytes, region, page_num, source):
+    """Runs in a worker process: parse one page and return it as (names and ranks, tile_count, max_page, source, empty)"""
+    page = PARSERS[parser](html_bytes.decode('utf-8'), region, page_num, source)
+    games = tuple((game['game_name'], game['display_rank']) for game in page['games'])
+    return games, page['tile_count'], page['max_page'], page['source'], page['empty']
+
+def _expand(result, region):
+    """Rebuild the page dict from a worker's compact result"""
+    games, tile_count, max_page, source, empty = result
+    return make_page([{'region': region, 'game_name': name, 'display_rank': rank} for name, rank in games],
+                     tile_count, max_page, source, empty)
+
+class ParsePool:
+    def __init__(self, workers=None):
+        """workers: parser processes (defaults to CRAWLER_CONFIG['parse_workers']; 0 parses in the calling thread)"""
+        workers = workers if workers is not None else CRAWLER_CONFIG['parse_workers']
+        self.workers = default_workers() if workers == 'auto' else workers
+        self.executor = None
+        self.log_listener = None
+        self.broken = False
+        self.lock = threading.Lock()
+
+    def _get_executor(self):
+        """Start the worker processes on first use"""
+        with self.lock:
+            if self.executor is None:
+                # spawn everywhere, so the workers never inherit a forked copy of Chrome-driving threads
+                context = multiprocessing.get_context('spawn')
+                log_queue = context.Queue()
+                self.log_listener = logging.handlers.QueueListener(log_queue, _ForwardHandler())
+                self.log_listener.start()
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                    initargs=(log_queue, logging.getLogger().getEffectiveLevel(), CRAWLER_CONFIG['parser_backend']))
+                logging.info(f"Parsing pages in {self.workers} worker process(es)")
+            return self.executor
+
+    def _parse(self, parser, html, region, page_num, source):
+        if self.workers < 1 or self.broken:
+            return PARSERS[parser](html, region, page_num, source)
+        try:
+            future = self._get_executor().submit(_parse_in_worker, parser, html.encode('utf-8'), region, page_num, source)
+            return _expand(future.result(), region)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory) - keep crawling with in-thread parsing
+            logging.warning(f"Parser process pool failed ({e}) - parsing in the crawler threads from now on")
+            self.broken = True
+            return PARSERS[parser](html, region, page_num, source)
+
+    def parse_html(self, html, region, page_num, source='http'):
+        """parser_backends.parse_html in a worker process"""
+        return self._parse('html', html, region, page_num, source)
+
+    def parse_tiles(self, html, region, page_num, source):
+        """parser_backends.parse_tiles in a worker process"""
+        return self._parse('tiles', html, region, page_num, source)
+
+    def shutdown(self):
+        """Stop the worker processes (they are started again if another page needs parsing)"""
+        with self.lock:
+            executor, listener = self.executor, self.log_listener
+            self.executor = self.log_listener = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if listener is not None:
+            listener.stop()
+
+parse_pool = ParsePool()
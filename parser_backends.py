@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML parser backends for category pages
+
+  'bs4'          - full BeautifulSoup tree with html.parser (the original behaviour)
+  'bs4-strained' - BeautifulSoup that only builds tiles and the paginator (SoupStrainer pre-filter)
+  'lxml'         - libxml2 tree queried with precompiled XPath
+  'selectolax'   - Lexbor tree queried with CSS selectors
+
+lxml and selectolax are optional; 'auto' picks the fastest one that is installed.
+"""
+
+import re
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from config import CRAWLER_CONFIG
+from page_parser import (TILE_QA_PATTERN, make_page, parse_soup, tile_record, games_from_tile_records,
+                         max_page_from_numbers, extract_games_from_state, is_empty_state_page)
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+try:
+    # The Lexbor backend - selectolax.parser (Modest) is deprecated and refuses to import from 1.0
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSER_BACKENDS = ['bs4', 'bs4-strained', 'lxml', 'selectolax']
+BACKEND_PREFERENCE = ['selectolax', 'lxml', 'bs4-strained']
+
+# Keep only tile subtrees and the paginator; everything else is never turned into Tag objects
+TILE_STRAINER = SoupStrainer(attrs={'data-qa': re.compile(r'productTile\d+|paginator')})
+PAGE_NUMBER_PATTERN = re.compile(r'^\d+$')
+TILE_CSS = "div[data-qa*='productTile'][data-qa-index]"
+PAGINATION_CSS = "button, a"
+
+if etree is not None:
+    TILE_XPATH = etree.XPath("//div[contains(@data-qa, 'productTile') and @data-qa-index]")
+    LINK_XPATH = etree.XPath(".//a[1]")
+    PAGINATION_XPATH = etree.XPath("//button | //a")
+
+_warned_backends = set()
+
+def available_backends():
+    """Backends that can run with the installed packages"""
+    backends = ['bs4', 'bs4-strained']
+    if etree is not None:
+        backends.append('lxml')
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    return backends
+
+def resolve_backend(name=None):
+    """Map the configured backend ('auto' or a name) to one that is installed"""
+    name = name or CRAWLER_CONFIG['parser_backend']
+    available = available_backends()
+    if name == 'auto':
+        return next(backend for backend in BACKEND_PREFERENCE if backend in available)
+    if name not in available:
+        if name not in _warned_backends:
+            logging.warning(f"Parser backend '{name}' is not installed - using 'bs4-strained'")
+            _warned_backends.add(name)
+        return 'bs4-strained'
+    return name
+
+def _safe_records(raw_tiles, region, page_num):
+    """Build tile records, skipping tiles whose index cannot be read (like extract_games does)"""
+    records = []
+    for index_value, has_link, telemetry_meta in raw_tiles:
+        try:
+            records.append(tile_record(index_value, has_link, telemetry_meta))
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error extracting game from {region} page {page_num}: {e}")
+    return records
+
+def _page_numbers(texts):
+    """Integers among pagination element texts"""
+    return [int(text) for text in texts if PAGE_NUMBER_PATTERN.match(text)]
+
+def _parse_lxml(html, region, page_num, source):
+    root = lxml_html.fromstring(html)
+    raw_tiles = []
+    for tile in TILE_XPATH(root):
+        if not TILE_QA_PATTERN.search(tile.get('data-qa', '')):
+            continue
+        links = LINK_XPATH(tile)
+        link = links[0] if links else None
+        raw_tiles.append((tile.get('data-qa-index'), link is not None,
+                          link.get('data-telemetry-meta') if link is not None else None))
+    records = _safe_records(raw_tiles, region, page_num)
+    numbers = _page_numbers(element.text_content().strip() for element in PAGINATION_XPATH(root))
+    return make_page(games_from_tile_records(records, region, page_num), len(records),
+                     max_page_from_numbers(numbers, page_num), source)
+
+def _parse_selectolax(html, region, page_num, source):
+    tree = LexborHTMLParser(html)
+    raw_tiles = []
+    for tile in tree.css(TILE_CSS):
+        if not TILE_QA_PATTERN.search(tile.attributes.get('data-qa') or ''):
+            continue
+        link = tile.css_first('a')
+        raw_tiles.append((tile.attributes.get('data-qa-index'), link is not None,
+                          link.attributes.get('data-telemetry-meta') if link is not None else None))
+    records = _safe_records(raw_tiles, region, page_num)
+    numbers = _page_numbers(node.text(strip=True) for node in tree.css(PAGINATION_CSS))
+    return make_page(games_from_tile_records(records, region, page_num), len(records),
+                     max_page_from_numbers(numbers, page_num), source)
+
+def parse_tiles(html, region, page_num, source, backend=None):
+    """Parse tiles and pagination from raw HTML with the chosen backend"""
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        return _parse_selectolax(html, region, page_num, source)
+    if backend == 'lxml':
+        return _parse_lxml(html, region, page_num, source)
+    if backend == 'bs4-strained':
+        return parse_soup(BeautifulSoup(html, 'html.parser', parse_only=TILE_STRAINER), region, page_num, source)
+    return parse_soup(BeautifulSoup(html, 'html.parser'), region, page_num, source)
+
+def parse_html(html, region, page_num, source='http', backend=None):
+    """
+    Parse raw category page HTML, falling back to the embedded page state when no tiles are rendered.
+    A page without tiles is marked empty if the store says the category has no results.
+    """
+    page = parse_tiles(html, region, page_num, source, backend)
+    if page['tile_count']:
+        return page
+    state_page = extract_games_from_state(html, region, page_num)
+    if state_page and (state_page['tile_count'] or state_page['empty']):
+        return state_page
+    if is_empty_state_page(html):
+        return make_page([], 0, None, source, empty=True)
+    return page
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Adaptive token-bucket rate limiter shared by every worker, tab and HTTP fetch
+Politeness towards the store is enforced here instead of sleeping after each page load.
+The rate follows AIMD: it creeps up while pages come back quickly and is cut
+multiplicatively on throttling signals (timeouts, empty pages, 429/403, challenge pages).
+"""
+
+import time
+import logging
+import threading
+from config import CRAWLER_CONFIG
+
+class RateLimiter:
+    def __init__(self, rate=None, burst=None):
+        """
+        rate: requests per second to start at
+        burst: requests that may be sent back to back after an idle period
+        """
+        self.rate = rate or CRAWLER_CONFIG['requests_per_second']
+        self.burst = burst or CRAWLER_CONFIG['rate_limit_burst']
+        self.min_rate = min(self.rate, CRAWLER_CONFIG['rate_limit_min'])
+        self.max_rate = max(self.rate, CRAWLER_CONFIG['rate_limit_max'])
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.last_decrease = None
+        self.throttle_events = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Block until a request may be sent. Callers reserve their token under the lock
+        and sleep outside it, so waiting threads are served in arrival order.
+        Returns the time spent waiting in seconds.
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def report_success(self, latency):
+        """A page came back with tiles; a healthy latency raises the rate additively"""
+        if latency > CRAWLER_CONFIG['rate_healthy_latency']:
+            return
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + CRAWLER_CONFIG['rate_increase_step'])
+
+    def report_throttle(self, reason):
+        """
+        The store pushed back; cut the rate multiplicatively.
+        Requests already in flight report the same episode, so the rate is cut
+        at most once per rate_decrease_cooldown seconds.
+        """
+        now = time.monotonic()
+        with self.lock:
+            self.throttle_events += 1
+            if self.last_decrease is not None and now - self.last_decrease < CRAWLER_CONFIG['rate_decrease_cooldown']:
+                return
+            self._refill(now)
+            old_rate = self.rate
+            self.rate = max(self.min_rate, self.rate * CRAWLER_CONFIG['rate_decrease_factor'])
+            self.last_decrease = now
+        logging.warning(f"Throttling signal ({reason}) - request rate {old_rate:.2f}/s -> {self.rate:.2f}/s")
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def get_shared_rate_limiter():
+    """The process-wide limiter used by all crawler workers"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
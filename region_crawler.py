@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Region crawler - owns one Chrome WebDriver (plus the HTTP fast path) and crawls
+every page of a region through it. PlayStationCrawler extends this with the
+daily run orchestration; BrowserWorkerPool runs several of these in parallel.
+"""
+
+import os
+import random
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from config import CRAWLER_CONFIG, NETWORK_BLOCKING_CONFIG
+from catalog_fingerprint import fingerprint_product_ids
+from page_parser import GAMES_PER_PAGE, MAX_PAGES, build_page_url, make_page
+from parse_pool import parse_pool
+from http_fetcher import HttpPageFetcher
+from rate_limiter import get_shared_rate_limiter
+from page_readiness import wait_for_page_ready, mark_stale, readiness_recorder
+from network_blocking import enable_resource_blocking, measure_page_weight
+from js_extraction import extract_page_with_js, pages_match
+from region_registry import empty_region_cache
+from driver_health import DriverSupervisor, is_driver_alive, probe_driver
+from stage_metrics import stage_metrics
+from region_profiler import region_profiler
+
+class DriverStartupError(Exception):
+    """Chrome could not be started - retrying pages on this crawler is pointless"""
+
+class IncompleteRegionError(Exception):
+    """An expected page of a region could not be fetched, so its ranking is not stored"""
+
+    def __init__(self, region, page_num, last_page, games):
+        super().__init__(f"{region} is incomplete: page {page_num} of {last_page} failed after retries "
+                         f"({len(games)} games collected)")
+        self.region = region
+        self.page_num = page_num
+        self.last_page = last_page
+        self.games = games
+
+def backoff_delay(attempt):
+    """Seconds to wait before retrying after the given failed attempt: exponential, capped, with jitter"""
+    delay = min(CRAWLER_CONFIG['retry_backoff_max'], CRAWLER_CONFIG['retry_backoff_base'] * 2 ** (attempt - 1))
+    # Half fixed, half random, so workers that failed together do not retry in lockstep
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def expected_last_page(last_page, page):
+    """Highest page the region is known to have, after seeing this page's pagination"""
+    if page is None or page['max_page'] is None:
+        return last_page
+    return max(last_page, min(page['max_page'], MAX_PAGES))
+
+def is_short_page(page_num, last_page, page):
+    """
+    Whether a fetched page ended early - short or flagged empty although the pagination
+    (seen so far, or on this page) announced later pages. Such a page counts as failed.
+    """
+    if page is None or page_num >= expected_last_page(last_page, page):
+        return False
+    return page['empty'] or page['tile_count'] < GAMES_PER_PAGE
+
+def is_page_promised(page_num, last_page, previous_page):
+    """
+    Whether a page beyond the first must exist - the pagination reported it, or the page
+    before it was full (a region without a pagination count only ends on a short page)
+    """
+    if page_num <= 1:
+        return False
+    if page_num <= last_page:
+        return True
+    return previous_page is not None and previous_page['tile_count'] >= GAMES_PER_PAGE
+
+class RegionCrawler:
+    def __init__(self, checkpoint=None):
+        """checkpoint: optional RunCheckpoint that fetched pages are recorded in and resumed from"""
+        self.checkpoint = checkpoint
+        self.rate_limiter = get_shared_rate_limiter()
+        self.supervisor = DriverSupervisor()
+        # Chrome is launched on first use, so database and config errors surface first
+        # and runs served entirely by the HTTP fast path never start a browser
+        self._driver = None
+        # HTTP fast path is tried first for every page when fetch_mode is 'auto'
+        self.http_fetcher = HttpPageFetcher(self.rate_limiter) if CRAWLER_CONFIG['fetch_mode'] == 'auto' else None
+        
+    @property
+    def driver(self):
+        """The crawler's WebDriver, started on first access"""
+        if self._driver is None:
+            self.setup_driver()
+        return self._driver
+    
+    def setup_driver(self):
+        """Setup Chrome WebDriver with optimized options using local ChromeDriver"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in background
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-logging")
+        chrome_options.add_argument("--disable-in-process-stack-traces")
+        chrome_options.add_argument("--disable-webgl")
+        chrome_options.add_argument("--disable-3d-apis")
+        chrome_options.add_argument("--disable-accelerated-2d-canvas")
+        chrome_options.add_argument("--disable-accelerated-jpeg-decoding")
+        chrome_options.add_argument("--disable-accelerated-mjpeg-decode")
+        chrome_options.add_argument("--disable-accelerated-video-decode")
+        chrome_options.add_argument("--disable-gpu-sandbox")
+        chrome_options.add_argument("--log-level=3")  # Suppress INFO, WARNING, ERROR logs
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        if CRAWLER_CONFIG['concurrency_mode'] == 'tabs':
+            # Return from navigation immediately so several tabs can load at once
+            chrome_options.page_load_strategy = 'none'
+        
+        # Use local ChromeDriver instead of automated download
+        # Path to local ChromeDriver
+        chromedriver_path = os.path.join(os.path.dirname(__file__), "chromedriver-win64", "chromedriver.exe")
+        
+        if not os.path.exists(chromedriver_path):
+            raise DriverStartupError(f"ChromeDriver not found at: {chromedriver_path}")
+        
+        logging.info(f"Using local ChromeDriver at: {chromedriver_path}")
+        
+        driver = None
+        try:
+            service = Service(chromedriver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver.implicitly_wait(CRAWLER_CONFIG['implicit_wait'])
+            # A navigation that never finishes is treated as a hung session
+            driver.set_page_load_timeout(CRAWLER_CONFIG['page_load_timeout'])
+            enable_resource_blocking(driver)
+            
+            # Local health check - no external page load, so restricted networks can still start
+            browser_version = probe_driver(driver)
+            logging.info(f"WebDriver setup successful! (Chrome {browser_version})")
+            self._driver = driver
+                
+        except Exception as e:
+            logging.error(f"WebDriver setup failed: {e}")
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            raise DriverStartupError(f"WebDriver setup failed: {e}") from e
+        
+    def restart_driver(self, reason):
+        """Replace the WebDriver with a fresh one; pages already collected for the region are unaffected"""
+        logging.warning(f"Restarting WebDriver: {reason}")
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logging.debug(f"Error quitting the old WebDriver: {e}")
+            self._driver = None
+        self.setup_driver()
+        self.supervisor.driver_restarted()
+        stage_metrics.count('driver_restart')
+    
+    def ensure_healthy_driver(self):
+        """Recycle the driver before the next page if it has loaded too many pages or grown too large"""
+        reason = self.supervisor.restart_reason(self.driver)
+        if reason:
+            self.restart_driver(reason)
+    
+    def load_page(self, region, page_num):
+        """
+        Navigate to a category page and return the parsed page, or None if no tiles appeared.
+        A page showing the store's "no results" placeholder comes back at once, marked empty.
+        If the session hung or died, the driver is recreated and the error re-raised so the
+        page is retried on the fresh driver.
+        """
+        self.ensure_healthy_driver()
+        try:
+            page = self._load_page(region, page_num)
+        except TimeoutException:
+            self.restart_driver(f"navigation to {region} page {page_num} stalled")
+            raise
+        except WebDriverException:
+            if not is_driver_alive(self.driver):
+                self.restart_driver("session stopped responding")
+            raise
+        self.supervisor.page_loaded()
+        return page
+    
+    def _load_page(self, region, page_num):
+        url = build_page_url(region, page_num)
+        logging.info(f"Crawling {region} - Page {page_num}: {url}")
+        
+        # Navigate to page - politeness is enforced by the shared rate limiter
+        stage_metrics.observe('rate_limit_wait', self.rate_limiter.acquire(), region)
+        with stage_metrics.time('navigate', region):
+            # driver.get() does not wait for the new document with page_load_strategy 'none' (tabs mode)
+            mark_stale(self.driver)
+            self.driver.get(url)
+        
+        # Wait until the tile grid of this page has finished rendering
+        tile_count, latency, empty = wait_for_page_ready(self.driver, url=url, page_num=page_num)
+        stage_metrics.observe('readiness', latency, region)
+        page_weight = measure_page_weight(self.driver) if NETWORK_BLOCKING_CONFIG['record_page_weight'] else None
+        readiness_recorder.record(region, page_num, latency, tile_count, 'selenium', page_weight, empty)
+        if empty:
+            return make_page([], 0, None, 'selenium', empty=True)
+        if not tile_count:
+            logging.warning(f"Timeout waiting for content on {url}")
+            self.rate_limiter.report_throttle("no tiles before timeout")
+            return None
+        self.rate_limiter.report_success(latency)
+        
+        return self.extract_loaded_page(region, page_num)
+    
+    def extract_loaded_page(self, region, page_num, source='selenium'):
+        """
+        Extract tiles from the page currently loaded in the driver.
+        In 'js' extraction mode the tiles are collected in the browser with one script call;
+        Parsing page_source with the configured parser backend is the fallback and,
+        with verify_extraction, the cross-check.
+        """
+        if CRAWLER_CONFIG['extraction_mode'] == 'js':
+            with stage_metrics.time('extraction', region):
+                page = extract_page_with_js(self.driver, region, page_num, f"{source}-js")
+            if page is not None:
+                if not CRAWLER_CONFIG['verify_extraction']:
+                    return page
+                parsed_page = self.parse_loaded_page(region, page_num, source)
+                if pages_match(page, parsed_page):
+                    return page
+                logging.warning(f"In-page extraction disagrees with the HTML parser for {region} page {page_num} - using the HTML parser")
+                return parsed_page
+            logging.info(f"In-page extraction found no tiles for {region} page {page_num} - falling back to the HTML parser")
+        
+        return self.parse_loaded_page(region, page_num, source)
+    
+    def parse_loaded_page(self, region, page_num, source):
+        """Get the loaded page's source and parse it with the configured parser backend, in the parser process pool"""
+        with stage_metrics.time('extraction', region):
+            html = self.driver.page_source
+        with stage_metrics.time('parse', region):
+            return parse_pool.parse_tiles(html, region, page_num, source)
+    
+    def fetch_page(self, region, page_num):
+        """
+        Fetch one category page, trying the HTTP fast path before Selenium.
+        Returns the parsed page, or None if no tiles appeared in the browser.
+        """
+        if self.http_fetcher:
+            page = self.http_fetcher.fetch_page(region, page_num)
+            if page and (page['tile_count'] or page['empty']):
+                return page
+            logging.info(f"HTTP fast path found no tiles for {region} page {page_num} - falling back to Selenium")
+        
+        return self.load_page(region, page_num)
+    
+    def _fetch_http_page(self, region, page_num):
+        """HTTP fast path for one page of a fan-out; errors only cost this page its fast path"""
+        try:
+            return self.http_fetcher.fetch_page(region, page_num)
+        except Exception as e:
+            logging.warning(f"HTTP fetch failed for {region} page {page_num}: {e}")
+            return None
+    
+    def prefetch_http_pages(self, region, page_nums):
+        """
+        Fetch several pages of a region concurrently over the HTTP fast path.
+        Returns {page_num: page} for the pages whose tiles were found; the shared
+        rate limiter still paces every request, the fan-out only overlaps their latency.
+        """
+        page_nums = list(page_nums)
+        workers = CRAWLER_CONFIG['page_fanout_workers']
+        if not self.http_fetcher or len(page_nums) < 2 or workers < 2:
+            return {}
+        
+        logging.info(f"Fetching pages {page_nums[0]}-{page_nums[-1]} of {region} with {workers} parallel requests")
+        pages = {}
+        with ThreadPoolExecutor(max_workers=min(workers, len(page_nums)), thread_name_prefix=f"pages-{region}") as executor:
+            for page_num, page in zip(page_nums, executor.map(lambda n: self._fetch_http_page(region, n), page_nums)):
+                if page and page['tile_count']:
+                    pages[page_num] = page
+        return pages
+    
+    def fanout_pages(self, page_num, page):
+        """
+        Page numbers still to fetch once a page reports the region's page count, or [] if
+        pagination is unknown (the crawl then keeps discovering pages one at a time)
+        """
+        if page is None or page['max_page'] is None:
+            return []
+        if page['source'] not in ('http', 'state'):
+            # Tiles are client-rendered here, so the other pages would not come over HTTP either
+            return []
+        return list(range(page_num + 1, min(page['max_page'], MAX_PAGES) + 1))
+    
+    def process_page(self, region, page_num, page, all_games):
+        """
+        Add a fetched page to the region's results and decide whether to continue.
+        Returns True if the next page should be fetched.
+        """
+        if page is None:
+            # If no content on first page, this region might not have pre-orders
+            if page_num == 1:
+                logging.info(f"No pre-order content found for {region}")
+            return False
+        
+        if not page['tile_count']:
+            logging.info(f"No games found on page {page_num} for {region}")
+            # If no games on first page, region might not have pre-orders
+            if page_num == 1:
+                logging.info(f"No pre-order games available for {region}")
+                if page['empty']:
+                    # The store said so explicitly - remember it and skip the region for a while
+                    empty_region_cache.confirm(region)
+            return False
+        
+        logging.info(f"Found {page['tile_count']} games on page {page_num} for {region} (via {page['source']})")
+        
+        all_games.extend(page['games'])
+        if self.checkpoint and page['source'] != 'checkpoint':
+            self.checkpoint.record_page(region, page_num, page)
+        
+        # Check for next page by looking at pagination or by checking if we got a full page
+        # If we got fewer games than expected on this page, we're probably at the end
+        if page['tile_count'] < GAMES_PER_PAGE:
+            logging.info(f"Reached last page for {region} at page {page_num} (only {page['tile_count']} games)")
+            return False
+        
+        # Also check for actual pagination elements
+        if page['max_page'] is not None and page_num >= page['max_page']:
+            logging.info(f"Reached max pagination for {region} at page {page_num}")
+            return False
+        
+        # Safety check - limit pages to prevent infinite loops
+        if page_num >= MAX_PAGES:  # Reasonable limit
+            logging.warning(f"Reached page limit for {region}")
+            return False
+        
+        return True
+    
+    def fetch_page_with_retries(self, region, page_num, max_attempts=None, last_page=1):
+        """
+        Fetch one page, retrying just that page with exponential backoff and jitter.
+        Returns the page, or None if no tiles appeared after every attempt. A confirmed
+        empty page is returned without retrying, unless it comes before last_page: a short
+        or empty page there is retried too, and returned as is once attempts run out.
+        """
+        if max_attempts is None:
+            max_attempts = CRAWLER_CONFIG['max_retries']
+        
+        short_page = None
+        for attempt in range(1, max_attempts + 1):
+            try:
+                page = self.fetch_page(region, page_num)
+                if is_short_page(page_num, last_page, page):
+                    short_page = page
+                    logging.warning(f"Only {page['tile_count']} tiles on {region} page {page_num} before the last page "
+                                    f"(attempt {attempt}/{max_attempts})")
+                elif page is not None and (page['tile_count'] or page['empty']):
+                    return page
+                else:
+                    logging.warning(f"No tiles on {region} page {page_num} (attempt {attempt}/{max_attempts})")
+            except DriverStartupError:
+                raise
+            except Exception as e:
+                logging.error(f"Attempt {attempt}/{max_attempts} failed for {region} page {page_num}: {e}")
+            if attempt < max_attempts:
+                stage_metrics.count('page_retry')
+                with stage_metrics.time('retry_backoff', region):
+                    time.sleep(backoff_delay(attempt))
+        return short_page
+    
+    def resume_pages(self, region):
+        """Pages of the region fetched earlier today by an interrupted run, as {page_num: page}"""
+        if not self.checkpoint:
+            return {}
+        pages = self.checkpoint.completed_pages(region)
+        if pages:
+            logging.info(f"Resuming {region} with {len(pages)} page(s) from the checkpoint")
+        return pages
+    
+    def get_games_from_page(self, region, max_attempts=None):
+        """
+        Extract all games from all pages for a given region.
+        Every page is retried on its own, so a failure late in the region only costs that page.
+        Raises IncompleteRegionError if a page the pagination or a full previous page promised
+        could not be fetched, or a page before the announced last page stayed short.
+        """
+        all_games = []
+        page_num = 1
+        last_page = 1
+        previous_page = None
+        prefetched = self.resume_pages(region)
+        
+        while True:
+            page = prefetched.pop(page_num, None)
+            if page is None or is_short_page(page_num, last_page, page):
+                page = self.fetch_page_with_retries(region, page_num, max_attempts, last_page)
+            if is_short_page(page_num, last_page, page):
+                raise IncompleteRegionError(region, page_num, expected_last_page(last_page, page), all_games)
+            if page is None and is_page_promised(page_num, last_page, previous_page):
+                raise IncompleteRegionError(region, page_num, max(last_page, page_num), all_games)
+            if not self.process_page(region, page_num, page, all_games):
+                break
+            last_page = expected_last_page(last_page, page)
+            previous_page = page
+            if not prefetched:
+                # The first page with pagination gives the page count - fetch the rest at once,
+                # then process them in page order so ranks come out exactly as before
+                prefetched = self.prefetch_http_pages(region, self.fanout_pages(page_num, page))
+            page_num += 1
+        
+        logging.info(f"Total games found for {region}: {len(all_games)}")
+        return all_games
+    
+    def get_catalog_fingerprint(self, region):
+        """Fingerprint a storefront by hashing the ordered product IDs on its first page"""
+        try:
+            page = self.fetch_page(region, 1)
+            if page is None:
+                return None
+            games = list(page['games'])
+            games.sort(key=lambda game: game['display_rank'])
+            return fingerprint_product_ids([game['game_name'] for game in games])
+        except Exception as e:
+            logging.warning(f"Failed to fingerprint {region}: {e}")
+            return None
+    
+    def crawl_region_with_retries(self, region, max_retries=None):
+        """
+        Crawl a region with per-page retries.
+        Returns the region's games ([] if its first page never loaded); raises
+        IncompleteRegionError instead of returning a truncated ranking.
+        """
+        if max_retries is None:
+            max_retries = CRAWLER_CONFIG['max_retries']
+        
+        with stage_metrics.time('region', region), region_profiler.profile(region, 'crawl'):
+            games = self.get_games_from_page(region, max_retries)
+        if not games and not empty_region_cache.is_confirmed(region):
+            logging.error(f"Failed to crawl {region} after {max_retries} attempts")
+        return games
+    
+    def close(self):
+        """Release the WebDriver and the HTTP session"""
+        if self.http_fetcher:
+            self.http_fetcher.close()
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logging.warning(f"Error closing WebDriver: {e}")
+            self._driver = None
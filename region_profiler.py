@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-region profiling (`python main_crawler.py --profile`) - runs each region's crawl
+and database insert under cProfile, dumps one .prof file per region and stage, and writes
+a merged hot-function summary with the time split by library (BeautifulSoup, regex, JSON,
+logging, ...) and time spent waiting. When profiling is off no profiler is ever installed.
+
+From Python 3.12 cProfile is process-wide: a second enable() raises ValueError and the
+active profile records every thread, so overlapping regions would go unprofiled or be mixed
+into each other's profiles. There, profiled blocks run one at a time; on older versions each
+profiler only sees its own thread and blocks overlap freely.
+"""
+
+import os
+import io
+import re
+import sys
+import pstats
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from config import CRAWLER_CONFIG
+
+# (category, pattern matched against "<file>:<function>") - first match wins
+CATEGORIES = [
+    # cProfile measures wall time, so blocking on locks, futures and sleeps shows up as well
+    ('waiting', re.compile(r"_thread\.(lock|RLock)|time\.sleep|'select\.|built-in method select\.")),
+    ('BeautifulSoup', re.compile(r'[/\\]bs4[/\\]|soupsieve')),
+    ('lxml / selectolax', re.compile(r'lxml|selectolax')),
+    ('regex', re.compile(r"[/\\]re[/\\]|sre_|_sre|'re\.Pattern'|'re\.Match'")),
+    ('JSON', re.compile(r'[/\\]json[/\\]|_json')),
+    ('logging', re.compile(r'[/\\]logging[/\\]')),
+    ('selenium', re.compile(r'[/\\]selenium[/\\]')),
+    ('HTTP', re.compile(r'[/\\](requests|urllib3|http|ssl)[/\\]|socket|ssl')),
+    ('MySQL', re.compile(r'mysql')),
+]
+
+CRAWLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def categorize(filename, function):
+    if filename.startswith(CRAWLER_DIR):
+        return 'crawler'
+    location = f"{filename}:{function}"
+    for category, pattern in CATEGORIES:
+        if pattern.search(location):
+            return category
+    return 'other'
+
+class RegionProfiler:
+    """Per-(region, stage) cProfile collectors; only active after enable()"""
+
+    def __init__(self, profile_dir=None, top_n=None):
+        self.profile_dir = profile_dir or CRAWLER_CONFIG['profile_dir']
+        if not os.path.isabs(self.profile_dir):
+            self.profile_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), self.profile_dir)
+        self.top_n = top_n or CRAWLER_CONFIG['profile_top_n']
+        self.enabled = False
+        self.profiles = {}
+        self.skipped = 0
+        self.lock = threading.Lock()
+        # Held for the whole of a profiled block where cProfile is process-wide - see the module docstring
+        self.active = threading.RLock() if sys.version_info >= (3, 12) else nullcontext()
+
+    def enable(self):
+        self.enabled = True
+
+    def profile(self, region, stage):
+        """Context manager profiling the block under (region, stage); a no-op unless enabled"""
+        if not self.enabled or region is None:
+            return nullcontext()
+        return self._profiled(region, stage)
+
+    @contextmanager
+    def _profiled(self, region, stage):
+        # On Python 3.12+ other threads wait here (unprofiled) until the running block is done
+        with self.active:
+            with self.lock:
+                profile = self.profiles.setdefault((region, stage), cProfile.Profile())
+            try:
+                profile.enable()
+                enabled = True
+            except ValueError:
+                # A block nested in another profiled block of this thread (Python 3.12+) runs as part of it
+                with self.lock:
+                    self.skipped += 1
+                enabled = False
+            try:
+                yield
+            finally:
+                if enabled:
+                    profile.disable()
+
+    def dump(self):
+        """
+        Write <region>-<stage>.prof for every profiled block and summary.txt with the merged
+        top functions and CPU time per category. Returns (summary path, {category: seconds}),
+        or (None, None) if nothing was profiled.
+        """
+        with self.lock:
+            profiles = dict(self.profiles)
+        if not profiles:
+            return None, None
+
+        run_dir = os.path.join(self.profile_dir, datetime.now().strftime('%Y%m%d-%H%M%S'))
+        os.makedirs(run_dir, exist_ok=True)
+        paths = []
+        for (region, stage), profile in sorted(profiles.items()):
+            path = os.path.join(run_dir, f"{region}-{stage}.prof")
+            profile.dump_stats(path)
+            paths.append(path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(paths[0], stream=stream)
+        for path in paths[1:]:
+            stats.add(path)
+
+        by_category = {}
+        for (filename, _, function), (_, _, own_time, _, _) in stats.stats.items():
+            category = categorize(filename, function)
+            by_category[category] = by_category.get(category, 0.0) + own_time
+        by_category = dict(sorted(by_category.items(), key=lambda item: item[1], reverse=True))
+
+        stream.write(f"Merged profile of {len(paths)} region/stage files in {run_dir}\n")
+        if self.skipped:
+            stream.write(f"{self.skipped} nested block(s) were counted in the enclosing profile\n")
+        stream.write("\nTime by category (own time):\n")
+        for category, seconds in by_category.items():
+            stream.write(f"  {category:<20}{seconds:>10.3f}s\n")
+        stream.write("\n")
+        stats.sort_stats('tottime').print_stats(self.top_n)
+
+        summary_path = os.path.join(run_dir, 'summary.txt')
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(stream.getvalue())
+        logging.info(f"Profiles written to {run_dir}")
+        return summary_path, by_category
+
+region_profiler = RegionProfiler()
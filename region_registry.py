@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Region registry that caches validated PlayStation Store locale codes on disk,
+plus a negative cache of storefronts confirmed to have no pre-orders
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from config import REGION_CONFIG
+import check_ps_codes
+
+class RegionRegistry:
+    def __init__(self, cache_file=None, ttl_hours=None):
+        cache_file = cache_file or REGION_CONFIG['cache_file']
+        if not os.path.isabs(cache_file):
+            cache_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), cache_file)
+        self.cache_file = cache_file
+        self.ttl = timedelta(hours=ttl_hours if ttl_hours is not None else REGION_CONFIG['cache_ttl_hours'])
+        self.fingerprint_ttl = timedelta(hours=REGION_CONFIG['fingerprint_ttl_hours'])
+        self.empty_ttl = timedelta(hours=REGION_CONFIG['empty_region_ttl_hours'])
+
+    def load(self):
+        """Load the cached registry from disk, or None if it is missing or unreadable"""
+        if not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data['validated_at'] = datetime.fromisoformat(data['validated_at'])
+            if data.get('fingerprinted_at'):
+                data['fingerprinted_at'] = datetime.fromisoformat(data['fingerprinted_at'])
+            return data
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable region cache {self.cache_file}: {e}")
+            return None
+
+    def _write(self, data):
+        """Write the registry to disk, serializing timestamps"""
+        data = dict(data)
+        for key in ('validated_at', 'fingerprinted_at'):
+            if isinstance(data.get(key), datetime):
+                data[key] = data[key].isoformat()
+        # Write to a temp file first so a crash never leaves a half-written cache behind
+        tmp_file = self.cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+
+    def save(self, valid_codes):
+        """Write the validated codes to disk together with the validation timestamp"""
+        data = self.load() or {}
+        data['validated_at'] = datetime.now()
+        data['valid_codes'] = list(valid_codes)
+        self._write(data)
+        logging.info(f"Saved {len(valid_codes)} validated region codes to {self.cache_file}")
+
+    def save_catalog_groups(self, groups):
+        """Store the catalog-equivalence crawl plan {representative: [aliases]}"""
+        data = self.load()
+        if not data:
+            logging.warning("No region cache to attach catalog groups to - skipping save")
+            return
+        data['fingerprinted_at'] = datetime.now()
+        data['catalog_groups'] = groups
+        self._write(data)
+        aliased = sum(len(aliases) for aliases in groups.values())
+        logging.info(f"Saved catalog groups: {len(groups)} storefronts to crawl, {aliased} aliases")
+
+    def get_catalog_groups(self):
+        """Get the cached crawl plan, or None if it is missing or older than the fingerprint TTL"""
+        data = self.load()
+        if not data or not data.get('fingerprinted_at') or 'catalog_groups' not in data:
+            return None
+        if datetime.now() - data['fingerprinted_at'] > self.fingerprint_ttl:
+            return None
+        # Drop locales that have since stopped validating; a group whose representative
+        # stopped validating is crawled through its first alias that still validates
+        valid_codes = set(data['valid_codes'])
+        groups = {}
+        for representative, aliases in data['catalog_groups'].items():
+            members = [code for code in [representative] + aliases if code in valid_codes]
+            if members:
+                groups[members[0]] = members[1:]
+        return groups
+
+    def get_empty_regions(self):
+        """Regions confirmed empty within the empty-region TTL"""
+        data = self.load()
+        if not data:
+            return set()
+        now = datetime.now()
+        empty = set()
+        for region, confirmed_at in data.get('empty_regions', {}).items():
+            try:
+                if now - datetime.fromisoformat(confirmed_at) <= self.empty_ttl:
+                    empty.add(region)
+            except (TypeError, ValueError):
+                continue
+        return empty
+
+    def update_empty_regions(self, empty_regions, non_empty_regions):
+        """Record regions confirmed empty this run and forget those that have pre-orders again"""
+        data = self.load()
+        if not data:
+            logging.warning("No region cache to attach empty regions to - skipping save")
+            return
+        cached = dict(data.get('empty_regions', {}))
+        confirmed_at = datetime.now().isoformat(timespec='seconds')
+        for region in empty_regions:
+            cached[region] = confirmed_at
+        for region in non_empty_regions:
+            cached.pop(region, None)
+        data['empty_regions'] = cached
+        self._write(data)
+        logging.info(f"Saved {len(cached)} empty regions to the negative cache")
+
+    def is_stale(self, data):
+        """Check whether cached data is missing or older than the TTL"""
+        if not data:
+            return True
+        return datetime.now() - data['validated_at'] > self.ttl
+
+    def revalidate(self):
+        """Probe every known locale and refresh the cache"""
+        logging.info("Region cache is stale - revalidating region codes")
+        valid_codes = check_ps_codes.validate_codes(verbose=False)
+        if not valid_codes:
+            # A network outage should not wipe out a previously good region list
+            logging.warning("Region validation returned no valid codes - keeping existing cache")
+            return None
+        self.save(valid_codes)
+        return valid_codes
+
+    def get_valid_codes(self, revalidate=True):
+        """
+        Get validated region codes.
+        Uses the on-disk cache while it is fresh. When it is stale, the codes are
+        re-probed only if revalidate is True; otherwise the stale cache (or the full
+        list of known codes if there is no cache yet) is returned without touching the network.
+        """
+        data = self.load()
+
+        if not self.is_stale(data):
+            return data['valid_codes']
+
+        if revalidate:
+            valid_codes = self.revalidate()
+            if valid_codes:
+                return valid_codes
+
+        if data:
+            return data['valid_codes']
+        return list(check_ps_codes.country_codes)
+
+class EmptyRegionCache:
+    """
+    Thread-safe record of regions whose store page showed "no results" during this run,
+    backed by the registry's negative cache so they are skipped until the TTL expires
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or RegionRegistry()
+        self.confirmed = set()
+        self.lock = threading.Lock()
+
+    def confirm(self, region):
+        """A crawler saw the empty-state placeholder on the region's first page"""
+        with self.lock:
+            self.confirmed.add(region)
+
+    def is_confirmed(self, region):
+        with self.lock:
+            return region in self.confirmed
+
+    def cached(self):
+        """Regions still inside the negative cache TTL from earlier runs"""
+        return self.registry.get_empty_regions()
+
+    def save(self, non_empty_regions):
+        """Persist this run's confirmed empty regions"""
+        with self.lock:
+            confirmed = set(self.confirmed)
+        if confirmed or non_empty_regions:
+            self.registry.update_empty_regions(confirmed, non_empty_regions)
+
+empty_region_cache = EmptyRegionCache()
+
+if __name__ == "__main__":
+    registry = RegionRegistry()
+    codes = registry.revalidate()
+    if codes:
+        print(f"✅ Cached {len(codes)} valid region codes to {registry.cache_file}")
+    else:
+        print("❌ Region validation failed - cache not updated")
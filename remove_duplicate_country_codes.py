@@ -1,15 +1,24 @@
-import check_ps_codes
+from region_registry import RegionRegistry
 
-valid_codes = check_ps_codes.valid_codes
-country_map = {}
-for code in valid_codes:
-    # Extract country part (last two letters after last '-')
-    country = code.split('-')[-1]
-    # Prefer English if available
-    if country not in country_map or (code.startswith('en-') and not country_map[country].startswith('en-')):
-        country_map[country] = code
+def dedupe_codes(valid_codes):
+    """Keep one locale per country, preferring English where available"""
+    country_map = {}
+    for code in valid_codes:
+        # Extract country part (last two letters after last '-')
+        country = code.split('-')[-1]
+        # Prefer English if available
+        if country not in country_map or (code.startswith('en-') and not country_map[country].startswith('en-')):
+            country_map[country] = code
 
-unique_codes = sorted(country_map.values())
+    return sorted(country_map.values())
 
-print(unique_codes)
-print(len(unique_codes))
+def get_unique_codes(revalidate=True):
+    """Get deduplicated region codes, revalidating the cached registry if it is stale"""
+    return dedupe_codes(RegionRegistry().get_valid_codes(revalidate=revalidate))
+
+# Loaded from the on-disk cache only - importing this module never touches the network
+unique_codes = get_unique_codes(revalidate=False)
+
+if __name__ == "__main__":
+    print(unique_codes)
+    print(len(unique_codes))
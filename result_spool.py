@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Local spool for crawl results MySQL could not take - snapshots are appended to a SQLite
+file while the database is unreachable (at startup or mid-run), so the crawl carries on
+and no browser time is lost. `python main_crawler.py flush-spool` bulk-loads them into
+preorder_games once MySQL is back; rows are only removed from the spool after they are
+committed, and re-flushing a row just rewrites the same (crawl_date, region). A spooled row
+is dropped when a later crawl of its region is written to MySQL, so it never overwrites
+newer data.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime
+from config import DB_WRITE_CONFIG
+from database_utils import game_info_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spooled_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawl_date TEXT NOT NULL,
+    region TEXT NOT NULL,
+    game_info TEXT NOT NULL,
+    spooled_at TEXT NOT NULL
+);
+"""
+
+class ResultSpool:
+    def __init__(self, spool_file=None):
+        """spool_file: SQLite file (defaults to DB_WRITE_CONFIG['spool_file'], relative to this directory)"""
+        spool_file = spool_file or DB_WRITE_CONFIG['spool_file']
+        if not os.path.isabs(spool_file):
+            spool_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), spool_file)
+        self.spool_file = spool_file
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def _connect(self):
+        """Open (and create) the spool file on first use - a run that never loses MySQL leaves no file behind"""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.spool_file, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def append(self, snapshots, crawl_date=None):
+        """
+        Spool [(region, games_data)] with the crawl date they belong to (defaults to today).
+        Returns False if the rows could not be written to disk either.
+        """
+        crawl_date = (crawl_date or date.today()).isoformat()
+        spooled_at = datetime.now().isoformat(timespec='seconds')
+        try:
+            with self.lock:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT INTO spooled_snapshots (crawl_date, region, game_info, spooled_at) VALUES (?, ?, ?, ?)",
+                    [(crawl_date, region, game_info_json(games_data), spooled_at) for region, games_data in snapshots])
+                connection.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error spooling {len(snapshots)} region snapshot(s) to {self.spool_file}: {e}")
+            return False
+        logging.info(f"Spooled {len(snapshots)} region snapshot(s) to {self.spool_file}")
+        return True
+
+    def pending(self):
+        """Number of spooled rows not yet loaded into MySQL"""
+        if self.connection is None and not os.path.exists(self.spool_file):
+            return 0
+        with self.lock:
+            return self._connect().execute("SELECT COUNT(*) FROM spooled_snapshots").fetchone()[0]
+
+    def discard(self, regions, crawl_date=None):
+        """Drop spooled rows of these regions for crawl_date (defaults to today) - a newer snapshot is in MySQL"""
+        if self.connection is None and not os.path.exists(self.spool_file):
+            return
+        crawl_date = (crawl_date or date.today()).isoformat()
+        try:
+            with self.lock:
+                connection = self._connect()
+                deleted = connection.executemany("DELETE FROM spooled_snapshots WHERE crawl_date = ? AND region = ?",
+                                                 [(crawl_date, region) for region in regions]).rowcount
+                connection.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Error dropping superseded rows from {self.spool_file}: {e}")
+            return
+        if deleted:
+            logging.info(f"Dropped {deleted} spooled row(s) superseded by this run's snapshots")
+
+    def flush(self, db_manager, batch_size=None):
+        """
+        Bulk-load the spool into preorder_games, oldest rows first, one transaction per batch.
+        A batch MySQL rejects is retried row by row; rows that still fail stay in the spool.
+        Returns (rows flushed, rows left in the spool).
+        """
+        if not self.pending():
+            return 0, 0
+        batch_size = batch_size or DB_WRITE_CONFIG['batch_size']
+        with self.lock:
+            rows = self._connect().execute(
+                "SELECT id, crawl_date, region, game_info FROM spooled_snapshots ORDER BY id").fetchall()
+
+        flushed = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            if db_manager.insert_rows([row[1:] for row in batch]):
+                written = batch
+            elif db_manager.test_connection():
+                # Reachable, so some row is bad - keep only that one in the spool
+                written = [row for row in batch if db_manager.insert_rows([row[1:]])]
+            else:
+                logging.error("MySQL is unavailable - stopping the spool flush")
+                break
+            self._remove([row[0] for row in written])
+            flushed += len(written)
+
+        remaining = self.pending()
+        logging.info(f"Flushed {flushed} spooled row(s) into preorder_games, {remaining} left in {self.spool_file}")
+        return flushed, remaining
+
+    def _remove(self, ids):
+        """Drop rows that are committed to MySQL"""
+        with self.lock:
+            self.connection.executemany("DELETE FROM spooled_snapshots WHERE id = ?", [(row_id,) for row_id in ids])
+            self.connection.commit()
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
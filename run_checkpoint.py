@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Crash-safe checkpoint of a daily run - records which regions were stored and which
+pages were fetched for today's crawl_date in a local SQLite file, so an interrupted
+run can be resumed with `python main_crawler.py --resume` instead of starting over
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime
+from config import CRAWLER_CONFIG
+from page_parser import make_page
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint_regions (
+    crawl_date TEXT NOT NULL,
+    region TEXT NOT NULL,
+    status TEXT NOT NULL,
+    game_count INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (crawl_date, region)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_pages (
+    crawl_date TEXT NOT NULL,
+    region TEXT NOT NULL,
+    page_num INTEGER NOT NULL,
+    games TEXT NOT NULL,
+    tile_count INTEGER NOT NULL,
+    max_page INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (crawl_date, region, page_num)
+);
+"""
+
+class RunCheckpoint:
+    def __init__(self, checkpoint_file=None, crawl_date=None):
+        """
+        checkpoint_file: SQLite file (defaults to CRAWLER_CONFIG['checkpoint_file'], relative to this directory)
+        crawl_date: the run being checkpointed (defaults to today, like DatabaseManager)
+        """
+        checkpoint_file = checkpoint_file or CRAWLER_CONFIG['checkpoint_file']
+        if not os.path.isabs(checkpoint_file):
+            checkpoint_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), checkpoint_file)
+        self.checkpoint_file = checkpoint_file
+        self.crawl_date = (crawl_date or date.today()).isoformat()
+        # Workers record pages from their own threads; one connection guarded by a lock
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(checkpoint_file, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._prune_old_runs()
+
+    def _execute(self, query, values=()):
+        """Run one write and commit it, so it survives a crash right after"""
+        with self.lock:
+            self.connection.execute(query, values)
+            self.connection.commit()
+
+    def _prune_old_runs(self):
+        """Only today's run can be resumed - drop earlier dates"""
+        for table in ('checkpoint_regions', 'checkpoint_pages'):
+            self._execute(f"DELETE FROM {table} WHERE crawl_date < ?", (self.crawl_date,))
+
+    def reset(self):
+        """Forget today's progress (a fresh, non-resumed run)"""
+        for table in ('checkpoint_regions', 'checkpoint_pages'):
+            self._execute(f"DELETE FROM {table} WHERE crawl_date = ?", (self.crawl_date,))
+
+    def record_page(self, region, page_num, page):
+        """Remember a fetched page so a resumed run does not load it again"""
+        self._execute(
+            "INSERT OR REPLACE INTO checkpoint_pages "
+            "(crawl_date, region, page_num, games, tile_count, max_page, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.crawl_date, region, page_num, json.dumps(page['games']), page['tile_count'],
+             page['max_page'], datetime.now().isoformat(timespec='seconds')))
+
+    def completed_pages(self, region):
+        """{page_num: page} for the pages of a region fetched earlier today"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT page_num, games, tile_count, max_page FROM checkpoint_pages "
+                "WHERE crawl_date = ? AND region = ?", (self.crawl_date, region)).fetchall()
+        pages = {}
+        for page_num, games, tile_count, max_page in rows:
+            try:
+                pages[page_num] = make_page(json.loads(games), tile_count, max_page, 'checkpoint')
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring corrupt checkpoint for {region} page {page_num}")
+        return pages
+
+    def mark_region(self, region, status, game_count=0):
+        """
+        Record how a region ended ('stored' once it is in the database, 'spooled' once it is in
+        the local spool waiting for MySQL, 'empty' if the store confirmed it has no pre-orders,
+        or 'failed'). Pages of a stored or spooled region are no longer needed.
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO checkpoint_regions (crawl_date, region, status, game_count, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.crawl_date, region, status, game_count, datetime.now().isoformat(timespec='seconds')))
+        if status in ('stored', 'spooled'):
+            self._execute("DELETE FROM checkpoint_pages WHERE crawl_date = ? AND region = ?", (self.crawl_date, region))
+
+    def stored_regions(self):
+        """Regions already written to the database today"""
+        return self.finished_regions(('stored',))
+
+    def finished_regions(self, statuses=('stored', 'spooled', 'empty')):
+        """Regions that ended today with one of the given statuses and need no further crawling"""
+        placeholders = ', '.join('?' for _ in statuses)
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT region FROM checkpoint_regions WHERE crawl_date = ? AND status IN ({placeholders})",
+                (self.crawl_date, *statuses)).fetchall()
+        return {region for (region,) in rows}
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self.lock:
+            self.connection.close()
+
+if __name__ == "__main__":
+    checkpoint = RunCheckpoint()
+    stored = sorted(checkpoint.stored_regions())
+    print(f"Checkpoint {checkpoint.checkpoint_file} for {checkpoint.crawl_date}: {len(stored)} regions stored")
+    for region in stored:
+        print(f"  {region}")
+    checkpoint.close()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Per-stage crawl timing - histograms of how long each stage of a page or region takes
+(rate limiter wait, HTTP fetch, navigation, readiness wait, extraction, parsing, retry
+backoff, database insert, whole region), written after every run as a timestamped JSON file
+and in Prometheus text exposition format so runs can be compared across days
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from config import CRAWLER_CONFIG
+
+# Upper bounds (seconds) of the histogram buckets, from a fast parse to a slow region
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+METRIC_PREFIX = 'ps_crawler'
+
+class StageHistogram:
+    """Timings of one stage: cumulative bucket counts for Prometheus plus the raw samples for percentiles"""
+
+    def __init__(self):
+        self.samples = []
+        self.bucket_counts = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+
+    def summary(self):
+        samples = sorted(self.samples)
+        def percentile(p):
+            return samples[min(len(samples) - 1, int(round(p * (len(samples) - 1))))]
+        return {
+            'count': len(samples),
+            'sum': round(sum(samples), 3),
+            'p50': round(percentile(0.50), 4),
+            'p95': round(percentile(0.95), 4),
+            'max': round(samples[-1], 4),
+            'buckets': {str(bound): count for bound, count in zip(BUCKETS, self.bucket_counts)}
+        }
+
+class StageMetrics:
+    """Thread-safe stage timers and event counters for one crawler run"""
+
+    def __init__(self, metrics_dir=None):
+        metrics_dir = metrics_dir or CRAWLER_CONFIG['metrics_dir']
+        if not os.path.isabs(metrics_dir):
+            metrics_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), metrics_dir)
+        self.metrics_dir = metrics_dir
+        self.started = datetime.now()
+        self.stages = {}
+        self.region_totals = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, stage, seconds, region=None):
+        """Record one timing of a stage, attributed to a region if given"""
+        with self.lock:
+            self.stages.setdefault(stage, StageHistogram()).observe(seconds)
+            if region is not None and stage != 'region':
+                totals = self.region_totals.setdefault(region, {})
+                totals[stage] = totals.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def time(self, stage, region=None):
+        """Time the body of a with-block as one observation of the stage"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - start, region)
+
+    def count(self, event, amount=1):
+        """Increment an event counter (page retries, driver restarts, ...)"""
+        with self.lock:
+            self.counters[event] = self.counters.get(event, 0) + amount
+
+    def summary(self):
+        """{stage: {count, sum, p50, p95, max, buckets}} for this run"""
+        with self.lock:
+            return {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())}
+
+    def to_json(self):
+        summary = self.summary()
+        with self.lock:
+            regions = {region: {stage: round(seconds, 3) for stage, seconds in sorted(totals.items())}
+                       for region, totals in sorted(self.region_totals.items())}
+            counters = dict(sorted(self.counters.items()))
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'finished': datetime.now().isoformat(timespec='seconds'),
+            'stages': summary,
+            'counters': counters,
+            'regions': regions
+        }
+
+    def to_prometheus(self):
+        """The run's histograms and counters in Prometheus text exposition format"""
+        with self.lock:
+            stages = {stage: (list(histogram.bucket_counts), len(histogram.samples), sum(histogram.samples))
+                      for stage, histogram in sorted(self.stages.items())}
+            counters = dict(sorted(self.counters.items()))
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent in each crawl stage during the last run",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds histogram"
+        ]
+        for stage, (bucket_counts, count, total) in stages.items():
+            for bound, bucket_count in zip(BUCKETS, bucket_counts):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {bucket_count}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {count}')
+        lines += [
+            f"# HELP {METRIC_PREFIX}_events_total Crawl events during the last run",
+            f"# TYPE {METRIC_PREFIX}_events_total counter"
+        ]
+        for event, value in counters.items():
+            lines.append(f'{METRIC_PREFIX}_events_total{{event="{event}"}} {value}')
+        lines += [
+            f"# HELP {METRIC_PREFIX}_last_run_timestamp_seconds Start of the last run (Unix time)",
+            f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_last_run_timestamp_seconds {self.started.timestamp():.0f}"
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """
+        Write stage_timings_<run start>.json (one file per run, for comparing runs) and
+        stage_timings.prom (latest run, for a node_exporter textfile collector).
+        Returns the JSON path, or None if the files could not be written.
+        """
+        json_path = os.path.join(self.metrics_dir, f"stage_timings_{self.started.strftime('%Y-%m-%d_%H%M%S')}.json")
+        prom_path = os.path.join(self.metrics_dir, 'stage_timings.prom')
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f, indent=2)
+            # Write then rename, so a scraper never reads a half-written file
+            with open(prom_path + '.tmp', 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(prom_path + '.tmp', prom_path)
+        except OSError as e:
+            logging.warning(f"Could not write stage timings to {self.metrics_dir}: {e}")
+            return None
+        return json_path
+
+stage_metrics = StageMetrics()
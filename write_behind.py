@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Write-behind buffer for region snapshots - finished regions (plus the aliases sharing their
+catalog) are collected and written by a background thread with one executemany and one
+commit per batch, flushed when the batch is full or flush_interval seconds after its first
+snapshot. The caller goes straight back to crawling instead of waiting on a commit.
+
+A failed batch is retried with exponential backoff and then region by region, so one bad
+row cannot fail its neighbours. Until a region's batch commits, its pages stay in the run
+checkpoint, so even snapshots lost in a crash are restored by `--resume` without refetching.
+
+With a ResultSpool, snapshots MySQL cannot take are spooled to disk instead of failing.
+Once MySQL is found unreachable the buffer goes offline and spools every batch, trying the
+database again (once) every reconnect_interval seconds.
+"""
+
+import time
+import queue
+import logging
+import threading
+from config import DB_WRITE_CONFIG
+from stage_metrics import stage_metrics
+from region_profiler import region_profiler
+
+_CLOSE = object()
+
+class Snapshot:
+    """One crawled region waiting to be written, with the alias regions that reuse its games"""
+
+    def __init__(self, region, games, aliases=()):
+        self.region = region
+        self.games = games
+        self.aliases = list(aliases)
+        self.reported = False
+
+    def rows(self):
+        return [(self.region, self.games)] + [(alias, self.games) for alias in self.aliases]
+
+class WriteBehindBuffer:
+    def __init__(self, db_manager, on_stored=None, on_failed=None, batch_size=None, flush_interval=None,
+                 spool=None, on_spooled=None, offline=False):
+        """
+        db_manager: DatabaseManager (or anything with insert_snapshots) used from the writer thread
+        on_stored / on_failed: called with each Snapshot once its batch committed / gave up
+        spool / on_spooled: ResultSpool for snapshots MySQL cannot take, and the callback once one is spooled
+        offline: MySQL is already known to be unreachable - spool until a reconnect attempt succeeds
+        """
+        self.db_manager = db_manager
+        self.on_stored = on_stored
+        self.on_failed = on_failed
+        self.spool = spool
+        self.on_spooled = on_spooled
+        self.offline = offline and spool is not None
+        self.next_reconnect = time.monotonic() + DB_WRITE_CONFIG['reconnect_interval'] if self.offline else 0
+        self.batch_size = max(1, batch_size or DB_WRITE_CONFIG['batch_size'])
+        self.flush_interval = flush_interval if flush_interval is not None else DB_WRITE_CONFIG['flush_interval']
+        # Bounded, so a database that cannot keep up slows the crawl instead of growing memory
+        self.pending = queue.Queue(maxsize=4 * self.batch_size)
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self.thread.start()
+        return self
+
+    def add(self, region, games, aliases=()):
+        """
+        Queue a region's snapshot for writing; returns at once unless the buffer is full.
+        Raises RuntimeError if the writer thread is no longer running.
+        """
+        snapshot = Snapshot(region, games, aliases)
+        while self.thread is not None and self.thread.is_alive():
+            try:
+                self.pending.put(snapshot, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError(f"the database writer thread is not running - {region} was not written")
+
+    def close(self, timeout=None):
+        """
+        Flush everything still buffered and stop the writer thread, waiting at most timeout
+        seconds (defaults to DB_WRITE_CONFIG['close_timeout'])
+        """
+        if self.thread is None:
+            return
+        timeout = DB_WRITE_CONFIG['close_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        thread, self.thread = self.thread, None
+        if not thread.is_alive():
+            unwritten = []
+            while not self.pending.empty():
+                item = self.pending.get_nowait()
+                if item is not _CLOSE:
+                    unwritten.append(item)
+            logging.error(f"The database writer thread had already stopped - "
+                          f"{len(unwritten)} buffered snapshot(s) were not written")
+            self._report(unwritten, self.on_failed)
+            return
+        try:
+            self.pending.put(_CLOSE, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            # Their pages are still in the run checkpoint, so --resume rebuilds them
+            logging.error(f"The database writer did not finish within {timeout}s - leaving it behind; "
+                          f"regions not yet written are not checkpointed as stored")
+
+    def _run(self):
+        batch = []
+        rows = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.pending.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not None and item is not _CLOSE:
+                batch.append(item)
+                rows += len(item.rows())
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch and (item is None or item is _CLOSE or rows >= self.batch_size):
+                try:
+                    self._flush(batch)
+                except Exception as e:
+                    # Anything but a failed write (a bug, a broken spool) - the writer keeps running
+                    logging.error(f"Unexpected error writing {len(batch)} region snapshot(s): {e}")
+                    self._report([snapshot for snapshot in batch if not snapshot.reported], self.on_failed)
+                batch, rows, deadline = [], 0, None
+            if item is _CLOSE:
+                return
+
+    def _write(self, snapshots):
+        """One executemany + commit; True if the rows are in the database"""
+        rows = [row for snapshot in snapshots for row in snapshot.rows()]
+        # Profiled as <region>+<region>+...-insert, one profile per distinct batch
+        batch_regions = '+'.join(snapshot.region for snapshot in snapshots)
+        with stage_metrics.time('db_insert'), region_profiler.profile(batch_regions, 'insert'):
+            written = self.db_manager.insert_snapshots(rows)
+        stage_metrics.count('db_batches')
+        if written:
+            stage_metrics.count('db_rows', len(rows))
+            if self.spool is not None:
+                # Older spooled snapshots of these regions must not overwrite them when flushed
+                self.spool.discard(region for region, _ in rows)
+        return written
+
+    def _flush(self, batch):
+        """Write a batch, retrying with backoff, then region by region before giving up on a snapshot"""
+        if self.offline:
+            if time.monotonic() < self.next_reconnect:
+                self._spool(batch)
+                return
+            # One try per reconnect_interval - no backoff, the crawl is not waiting on MySQL
+            if not self._write(batch):
+                self.next_reconnect = time.monotonic() + DB_WRITE_CONFIG['reconnect_interval']
+                self._spool(batch)
+                return
+            logging.info("MySQL is reachable again - writing snapshots to the database")
+            self.offline = False
+            self._report(batch, self.on_stored)
+            return
+
+        max_attempts = DB_WRITE_CONFIG['max_attempts']
+        for attempt in range(1, max_attempts + 1):
+            if self._write(batch):
+                self._report(batch, self.on_stored)
+                return
+            if attempt < max_attempts:
+                delay = DB_WRITE_CONFIG['retry_backoff'] * 2 ** (attempt - 1)
+                logging.warning(f"Write of {len(batch)} region snapshot(s) failed (attempt {attempt}/{max_attempts}) "
+                                f"- retrying in {delay}s")
+                stage_metrics.count('db_batch_retry')
+                time.sleep(delay)
+
+        if self.spool is not None and not self.db_manager.test_connection():
+            logging.warning(f"MySQL is unreachable - spooling region snapshots to {self.spool.spool_file} "
+                            f"and retrying every {DB_WRITE_CONFIG['reconnect_interval']}s")
+            self.offline = True
+            self.next_reconnect = time.monotonic() + DB_WRITE_CONFIG['reconnect_interval']
+            self._spool(batch)
+            return
+        if len(batch) == 1:
+            logging.error(f"Giving up writing {batch[0].region} after {max_attempts} attempts")
+            self._report(batch, self.on_failed)
+            return
+        # Isolate the snapshot that keeps the batch from committing
+        for snapshot in batch:
+            if self._write([snapshot]):
+                self._report([snapshot], self.on_stored)
+            else:
+                logging.error(f"Giving up writing {snapshot.region} after {max_attempts} batch attempts")
+                self._report([snapshot], self.on_failed)
+
+    def _spool(self, batch):
+        """Keep snapshots MySQL did not take in the local spool (reported failed if even that fails)"""
+        if self.spool.append([row for snapshot in batch for row in snapshot.rows()]):
+            stage_metrics.count('db_spooled', len(batch))
+            self._report(batch, self.on_spooled)
+        else:
+            self._report(batch, self.on_failed)
+
+    def _report(self, snapshots, callback):
+        for snapshot in snapshots:
+            snapshot.reported = True
+            if callback is None:
+                continue
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logging.error(f"Error recording the write result for {snapshot.region}: {e}")